@@ -0,0 +1,164 @@
+# analytics.py
+"""
+Streaming per-question analytics, fed by every graded answer and skip.
+
+Counters live in fixed-size arrays indexed by question id (attempts, correct,
+skips, time-to-answer sum and sum of squares: 28 bytes per question). Wrong
+answers go into a per-question Space-Saving sketch of at most SKETCH_SIZE
+normalized answers. Its counts decay with every attempt at that question, so an
+answer players have started giving recently (a valid alias that ALIASES lacks,
+a mis-keyed answer) rises to the top.
+
+The same counters and sketches are kept in the results store, updated by its
+writer from each answer and skip row (results_store._DERIVED), so load() reads
+one row per question instead of replaying the answers log; the process-wide
+instance is fed live and kept current by reloading.py.
+
+    python analytics.py [results.db]   # print a report from the stored aggregates
+"""
+
+import math, sys, threading
+from array import array
+from grading import normalize
+from question_bank import QUESTIONS
+from reloading import reloading
+
+SKETCH_SIZE = 8       # tracked wrong answers per question
+SKETCH_DECAY = 0.97   # per attempt: ~30 attempts of memory
+MIN_ATTEMPTS = 10     # before a question is judged too hard / too easy
+RELOAD_SECONDS = 300
+
+class QuestionAnalytics:
+    def __init__(self, n: int = len(QUESTIONS)):
+        self.attempts = array("I", bytes(4 * n))
+        self.correct = array("I", bytes(4 * n))
+        self.skips = array("I", bytes(4 * n))
+        self.seconds = array("d", bytes(8 * n))     # sum of time-to-answer
+        self.seconds_sq = array("d", bytes(8 * n))  # sum of squares, for the spread
+        self.wrong = {}  # qid -> {normalized wrong answer: decayed count}, at most SKETCH_SIZE
+        self._lock = threading.Lock()
+
+    def _grow(self, qid: int) -> None:
+        extra = qid + 1 - len(self.attempts)
+        for counters in (self.attempts, self.correct, self.skips):
+            counters.extend(bytes(4 * extra))
+        for sums in (self.seconds, self.seconds_sq):
+            sums.extend(bytes(8 * extra))
+
+    def record_answer(self, qid: int, answer: str, correct: bool, seconds=None) -> None:
+        with self._lock:
+            if qid >= len(self.attempts):
+                self._grow(qid)
+            self.attempts[qid] += 1
+            if seconds is not None:
+                self.seconds[qid] += seconds
+                self.seconds_sq[qid] += seconds * seconds
+            sketch = self.wrong.get(qid)
+            if sketch:
+                for k in sketch:
+                    sketch[k] *= SKETCH_DECAY
+            if correct:
+                self.correct[qid] += 1
+                return
+            if sketch is None:
+                sketch = self.wrong[qid] = {}
+            key = normalize(answer or "")
+            if key in sketch or len(sketch) < SKETCH_SIZE:
+                sketch[key] = sketch.get(key, 0.0) + 1.0
+            else:
+                # Space-Saving: the newcomer takes over the smallest counter
+                low = min(sketch, key=sketch.get)
+                sketch[key] = sketch.pop(low) + 1.0
+
+    def record_skip(self, qid: int) -> None:
+        with self._lock:
+            if qid >= len(self.skips):
+                self._grow(qid)
+            self.skips[qid] += 1
+
+    # ---- reading ----
+    def accuracy(self, qid: int):
+        n = self.attempts[qid]
+        return self.correct[qid] / n if n else None
+
+    def mean_seconds(self, qid: int):
+        n = self.attempts[qid]
+        return self.seconds[qid] / n if n else None
+
+    def stdev_seconds(self, qid: int):
+        n = self.attempts[qid]
+        if n < 2:
+            return None
+        mean = self.seconds[qid] / n
+        return math.sqrt(max(self.seconds_sq[qid] / n - mean * mean, 0.0))
+
+    def top_wrong(self, qid: int, k: int = 3) -> list:
+        """(normalized answer, decayed count) for the most common recent wrong answers."""
+        sketch = self.wrong.get(qid) or {}
+        return sorted(sketch.items(), key=lambda kv: -kv[1])[:k]
+
+    def report(self, min_attempts: int = MIN_ATTEMPTS, hard: float = 0.2, easy: float = 0.95,
+               share: float = 0.5):
+        """Lists of qids: (too hard, too easy, likely false negatives as (qid, answer, count))."""
+        too_hard, too_easy, suspects = [], [], []
+        for qid in range(len(self.attempts)):
+            n = self.attempts[qid]
+            if n < min_attempts:
+                continue
+            acc = self.correct[qid] / n
+            if acc < hard:
+                too_hard.append(qid)
+            elif acc > easy:
+                too_easy.append(qid)
+            sketch = self.wrong.get(qid)
+            if sketch:
+                total = sum(sketch.values())
+                answer, count = max(sketch.items(), key=lambda kv: kv[1])
+                # One wrong answer dominating recent misses usually means it is right
+                if count >= 5 and count >= share * total and answer:
+                    suspects.append((qid, answer, count))
+        suspects.sort(key=lambda s: -s[2])
+        return too_hard, too_easy, suspects
+
+    def load(self, results) -> None:
+        """Replace everything with the aggregates stored in a results_store.ResultsStore."""
+        fresh = QuestionAnalytics(len(self.attempts))
+        for qid, attempts, correct, skips, seconds, seconds_sq in results.query(
+                "SELECT qid, attempts, correct, skips, seconds, seconds_sq FROM question_stats"):
+            if qid >= len(fresh.attempts):
+                fresh._grow(qid)
+            fresh.attempts[qid], fresh.correct[qid], fresh.skips[qid] = attempts, correct, skips
+            fresh.seconds[qid], fresh.seconds_sq[qid] = seconds, seconds_sq
+        for qid, answer, count in results.query(
+                "SELECT qid, answer, count FROM question_wrong ORDER BY rowid"):
+            fresh.wrong.setdefault(qid, {})[answer] = count
+        with self._lock:
+            self.attempts, self.correct, self.skips = fresh.attempts, fresh.correct, fresh.skips
+            self.seconds, self.seconds_sq, self.wrong = fresh.seconds, fresh.seconds_sq, fresh.wrong
+
+_ANALYTICS = reloading(QuestionAnalytics, RELOAD_SECONDS)
+
+def question_analytics(results=None) -> QuestionAnalytics:
+    """Process-wide analytics, shared by every session; loaded from results when given."""
+    return _ANALYTICS(results)
+
+def main(argv) -> None:
+    from results_store import ResultsStore, RESULTS_DB_PATH
+    store = ResultsStore(argv[0] if argv else RESULTS_DB_PATH)
+    stats = QuestionAnalytics()
+    stats.load(store)
+    store.close()
+    too_hard, too_easy, suspects = stats.report()
+    def line(qid):
+        return (f"  [{qid}] {QUESTIONS[qid]['q']}  (answer: {QUESTIONS[qid]['a']}; "
+                f"{stats.correct[qid]}/{stats.attempts[qid]} correct, {stats.skips[qid]} skips)")
+    print(f"Possible missing aliases / mis-keyed answers ({len(suspects)}):")
+    for qid, answer, count in suspects:
+        print(line(qid) + f"\n      players keep answering {answer!r} (~{count:.0f} recently)")
+    print(f"\nToo hard ({len(too_hard)}):")
+    print("\n".join(map(line, too_hard)))
+    print(f"\nToo easy ({len(too_easy)}):")
+    print("\n".join(map(line, too_easy)))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
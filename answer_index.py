@@ -0,0 +1,188 @@
+# answer_index.py
+"""
+Typo-tolerant lookup over every known answer: the normalized answer options of
+the bank (what is_correct accepts, e.g. both halves of "Green or red") plus the
+canonicals and variants of the alias index.
+
+    index = answer_index()
+    index.within("mississipi", 2)        # -> [(1, "mississippi")]: (distance, normalized answer)
+    index.suggest("lond")                # -> ["London"]: answers the input is a prefix of
+    index.suggest("geroge washington")   # -> ["George Washington"]: near misses
+
+Near misses come from a BK-tree keyed on grading's insert/delete edit distance
+(a metric, so the triangle inequality prunes every subtree whose edge distance
+is further than the bound from the query's distance to its root). A query at
+MAX_DISTANCE visits a few percent of the tree instead of every answer. Prefix
+completions bisect a sorted list of the same strings.
+
+Building needs an edit distance per tree level for every answer, so it is part
+of the bank cache (bank_cache.py): bank_cache.warm_start() installs the cached
+index, which pickles as flat arrays and is rebuilt without computing a single
+distance. answer_index() builds one itself only when nothing was installed.
+Alias index changes (reload_aliases, add_alias, install_alias_tables) drop it
+automatically; call invalidate_answer_index() after QUESTIONS changes.
+"""
+
+from array import array
+from bisect import bisect_left
+from grading import ALIASES, alias_tables, answer_options, normalize, on_aliases_changed
+from grading import _bounded_edit_distance
+from question_bank import QUESTIONS
+
+MAX_DISTANCE = 2  # near misses: one wrong or swapped letter, or two missing/extra ones
+SHORT_INPUT = 5   # shorter input: one missing/extra letter only
+MIN_PREFIX = 3    # shorter input gets no prefix completions
+
+def distance(a: str, b: str) -> int:
+    """Insert/delete edit distance (a substitution costs 2)."""
+    return _bounded_edit_distance(a, b, len(a) + len(b))
+
+class _Node:
+    __slots__ = ("word", "children")
+
+    def __init__(self, word: str):
+        self.word = word
+        self.children = {}  # distance to word -> _Node
+
+class AnswerIndex:
+    def __init__(self, questions=QUESTIONS, aliases=None):
+        self._root = None
+        self._display = {}   # normalized answer -> text to show (first raw spelling seen)
+        self._counts = {}    # normalized answer -> questions it answers (alias entries: 0)
+        self._sorted = None  # sorted normalized answers, for prefix lookups; rebuilt lazily
+        for qid in range(len(questions)):
+            # Only the answer text: no answer key is compiled (mapped banks compile on draw)
+            raw = questions.answer(qid)
+            options = answer_options(normalize(raw))
+            for p in options:
+                # A single-option answer shows as written; a part of "X or Y" as normalized
+                self.add(p, raw if len(options) == 1 else p, 1)
+        raw_aliases = {}
+        for canonical, variants in (ALIASES if aliases is None else aliases).items():
+            for raw in (canonical, *variants):
+                raw_aliases.setdefault(normalize(raw), raw)
+        variant_index, _canon = alias_tables()
+        for c_norm, variants in variant_index.items():
+            for norm in (c_norm, *variants):
+                self.add(norm, raw_aliases.get(norm, norm), 0)
+
+    def __len__(self):
+        return len(self._display)
+
+    # Pickled flat (words in insertion order, each with its parent and edge), so
+    # a deep tree never hits the recursion limit and loading computes no distances
+    def __getstate__(self):
+        words, parents, edges = [], array("i"), array("i")
+        stack = [(self._root, -1, 0)] if self._root is not None else []
+        while stack:  # parents are always written before their children
+            node, parent, edge = stack.pop()
+            stack.extend((child, len(words), d) for d, child in node.children.items())
+            words.append(node.word)
+            parents.append(parent)
+            edges.append(edge)
+        return {"words": words, "parents": parents, "edges": edges,
+                "display": self._display, "counts": self._counts}
+
+    def __setstate__(self, state) -> None:
+        self._display, self._counts, self._sorted = state["display"], state["counts"], None
+        nodes = [_Node(w) for w in state["words"]]
+        for node, parent, edge in zip(nodes, state["parents"], state["edges"]):
+            if parent >= 0:
+                nodes[parent].children[edge] = node
+        self._root = nodes[0] if nodes else None
+
+    def add(self, norm: str, display: str = None, count: int = 1) -> None:
+        """Index a normalized answer; repeats only bump its question count."""
+        if not norm:
+            return
+        if norm in self._display:
+            self._counts[norm] += count
+            return
+        self._display[norm] = display or norm
+        self._counts[norm] = count
+        self._sorted = None
+        if self._root is None:
+            self._root = _Node(norm)
+            return
+        node = self._root
+        while True:
+            d = distance(norm, node.word)
+            child = node.children.get(d)
+            if child is None:
+                node.children[d] = _Node(norm)
+                return
+            node = child
+
+    def within(self, text: str, k: int) -> list:
+        """(distance, normalized answer) for every answer within k edits of text, closest first."""
+        u = normalize(text or "")
+        if not u or self._root is None:
+            return []
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            d = distance(u, node.word)
+            if d <= k:
+                found.append((d, node.word))
+            for edge, child in node.children.items():
+                if d - k <= edge <= d + k:
+                    stack.append(child)
+        found.sort(key=lambda hit: (hit[0], -self._counts[hit[1]], hit[1]))
+        return found
+
+    def completions(self, text: str, limit: int = 5) -> list:
+        """Normalized answers starting with the (normalized) text, most used first."""
+        u = normalize(text or "")
+        if len(u) < MIN_PREFIX:
+            return []
+        if self._sorted is None:
+            self._sorted = sorted(self._display)
+        keys = self._sorted
+        hits = []
+        for i in range(bisect_left(keys, u), len(keys)):
+            if not keys[i].startswith(u):
+                break
+            hits.append(keys[i])
+        hits.sort(key=lambda w: (-self._counts[w], len(w), w))
+        return hits[:limit]
+
+    def suggest(self, text: str, limit: int = 5) -> list:
+        """
+        "Did you mean" texts for partial or misspelled input: answers it is a
+        prefix of, then answers within MAX_DISTANCE edits.
+        Empty when the input already is a known answer.
+        """
+        u = normalize(text or "")
+        if not u or u in self._display:
+            return []
+        k = MAX_DISTANCE if len(u) >= SHORT_INPUT else 1
+        words = self.completions(u, limit)
+        if k:
+            words += [w for _d, w in self.within(u, k) if w not in words]
+        shown = []
+        for w in words:
+            if self._display[w] not in shown:
+                shown.append(self._display[w])
+        return shown[:limit]
+
+_INDEX = None
+
+def answer_index() -> AnswerIndex:
+    """Process-wide index over QUESTIONS and the alias index (see install_answer_index)."""
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = AnswerIndex()
+    return _INDEX
+
+def install_answer_index(index: AnswerIndex) -> None:
+    """Use a prebuilt index (bank_cache.install)."""
+    global _INDEX
+    _INDEX = index
+
+def invalidate_answer_index() -> None:
+    """Call after QUESTIONS changes; the next lookup rebuilds."""
+    global _INDEX
+    _INDEX = None
+
+on_aliases_changed(invalidate_answer_index)
@@ -0,0 +1,111 @@
+# bank_cache.py
+"""
+Precomputed bank artifacts: answer keys, the category index, the alias index
+and the answer index (answer_index.py), written to a versioned cache file keyed
+by a content hash. A fresh process loads the file instead of re-deriving
+everything; any change to the bank, ALIASES, CATEGORY_FOLD or the grading code
+changes the hash and triggers a rebuild.
+
+    python bank_cache.py        # build step (e.g. in the container image)
+
+The file is a pickle: keep TRIVIA_CACHE_PATH on storage only this app writes to.
+"""
+
+import hashlib, json, os, pickle, sys, tempfile
+from typing import NamedTuple
+import answer_index, grading, numeric, textfold
+from answer_index import AnswerIndex, install_answer_index
+from grading import ALIASES, alias_tables, compile_answer, install_alias_tables
+from categories import CATEGORY_FOLD, build_category_index, install_category_index
+from question_bank import QUESTIONS
+from question_store import QuestionStore
+
+CACHE_VERSION = 2
+CACHE_PATH = os.environ.get(
+    "TRIVIA_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".bank_cache.pkl")
+)
+
+class BankArtifacts(NamedTuple):
+    digest: str
+    answer_keys: tuple      # one AnswerKey per question; None for mapped banks (compiled on draw)
+    category_index: object  # categories.CategoryIndex
+    alias_variants: dict
+    alias_canon: dict
+    answer_index: object    # answer_index.AnswerIndex
+
+def content_hash(questions=QUESTIONS) -> str:
+    h = hashlib.sha256(f"trivia-bank-cache/{CACHE_VERSION}".encode())
+    h.update(questions.content_digest().encode())
+    aliases = sorted((k, sorted(v)) for k, v in ALIASES.items())
+    h.update(json.dumps([aliases, sorted(CATEGORY_FOLD.items())], ensure_ascii=False).encode("utf-8"))
+    for module in (grading, numeric, textfold, answer_index):  # code they derive from
+        with open(module.__file__, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+def build_artifacts(questions=QUESTIONS, digest: str = "") -> BankArtifacts:
+    keys = None
+    if isinstance(questions, QuestionStore):
+        keys = tuple(compile_answer(a, (questions.extra(qid) or {}).get("tolerance"))
+                     for qid, a in enumerate(questions.answers))
+    variants, canon = alias_tables()
+    return BankArtifacts(
+        digest=digest or content_hash(questions),
+        answer_keys=keys,
+        category_index=build_category_index(questions),
+        alias_variants={k: set(v) for k, v in variants.items()},
+        alias_canon={k: set(v) for k, v in canon.items()},
+        answer_index=AnswerIndex(questions),
+    )
+
+def _read(path: str):
+    try:
+        with open(path, "rb") as f:
+            version, artifacts = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError, AttributeError):
+        return None
+    return artifacts if version == CACHE_VERSION else None
+
+def _write(path: str, artifacts: BankArtifacts) -> None:
+    """Atomic replace, so concurrently starting workers never see a half-written file."""
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".bank_cache.")
+    except OSError:  # read-only image etc.: run without a cache
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((CACHE_VERSION, artifacts), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        os.unlink(tmp)
+
+def load_or_build(questions=QUESTIONS, path: str = CACHE_PATH) -> BankArtifacts:
+    digest = content_hash(questions)
+    artifacts = _read(path)
+    if artifacts is None or artifacts.digest != digest:
+        artifacts = build_artifacts(questions, digest)
+        _write(path, artifacts)
+    return artifacts
+
+def install(artifacts: BankArtifacts, questions=QUESTIONS) -> None:
+    if artifacts.answer_keys is not None:
+        questions.set_answer_keys(artifacts.answer_keys)
+    install_category_index(artifacts.category_index)
+    install_alias_tables(artifacts.alias_variants, artifacts.alias_canon)
+    install_answer_index(artifacts.answer_index)
+
+_WARM = None
+
+def warm_start() -> BankArtifacts:
+    """Load (or build and save) the artifacts once per process and install them."""
+    global _WARM
+    if _WARM is None:
+        _WARM = load_or_build()
+        install(_WARM)
+    return _WARM
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else CACHE_PATH
+    built = build_artifacts()
+    _write(path, built)
+    print(f"wrote bank cache {built.digest[:12]} for {len(QUESTIONS)} questions to {path}")
@@ -0,0 +1,152 @@
+# bank_file.py
+"""
+On-disk question bank (.tqb): a compact binary file with an offset index, read
+through mmap so a process only materializes the questions it actually draws.
+
+Layout (little-endian):
+    header      "TQB1", u32 version, u32 count, u32 meta_len
+    meta        UTF-8 JSON: {"categories": [...], "digest": sha256 of the rest}
+    codes       u16 category code per question            (count * 2 bytes)
+    offsets     u64 start of each record in the text part  ((count + 1) * 8 bytes)
+    text        UTF-8 JSON object per question: {"q": ..., "a": ..., <extras>}
+
+Export the built-in bank once, then point the app at the file:
+    python bank_file.py questions.tqb                  # from question_bank's list
+    python bank_file.py questions.tqb bank.jsonl       # from a JSONL file
+    TRIVIA_BANK_PATH=questions.tqb streamlit run app_categories.py
+"""
+
+import hashlib, json, mmap, os, struct, sys, tempfile
+from array import array
+from functools import lru_cache
+from grading import compile_answer
+from question_store import BaseQuestionStore
+
+MAGIC = b"TQB1"
+VERSION = 1
+_HEADER = struct.Struct("<4sIII")
+_OFFSET = struct.Struct("<Q")
+_SPAN = struct.Struct("<QQ")
+RECORD_CACHE_SIZE = 4096
+
+def write_bank(questions, path: str) -> int:
+    """Write question dicts ("q", "a", "category", optional extras) to path; returns the count."""
+    categories, codes, offsets, chunks = {}, array("H"), array("Q", [0]), []
+    for q in questions:
+        code = categories.setdefault(q["category"], len(categories))
+        if code > 0xFFFF:
+            raise ValueError("too many distinct categories for u16 codes")
+        codes.append(code)
+        record = {k: v for k, v in q.items() if k not in ("category", "key")}
+        chunk = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        chunks.append(chunk)
+        offsets.append(offsets[-1] + len(chunk))
+    if sys.byteorder == "big":
+        codes.byteswap()
+        offsets.byteswap()
+    digest = hashlib.sha256(json.dumps(list(categories), ensure_ascii=False).encode("utf-8"))
+    digest.update(codes.tobytes())
+    digest.update(offsets.tobytes())
+    for chunk in chunks:
+        digest.update(chunk)
+    meta = json.dumps({"categories": list(categories), "digest": digest.hexdigest()},
+                      ensure_ascii=False).encode("utf-8")
+    # Atomic replace: processes that have the old file mapped keep reading it intact
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".bank.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(codes), len(meta)))
+            f.write(meta)
+            f.write(codes.tobytes())
+            f.write(offsets.tobytes())
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return len(codes)
+
+class MappedQuestionStore(BaseQuestionStore):
+    """
+    Read-only store over a .tqb file. Opening reads only the header, category
+    table and u16 codes (enough for the category index); question records are
+    decoded from the mapped text section on first access and kept in a bounded LRU.
+    """
+
+    def __init__(self, path: str, cache_size: int = RECORD_CACHE_SIZE):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, meta_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a version {VERSION} question bank file")
+        pos = _HEADER.size
+        self.path = path
+        meta = json.loads(self._mm[pos:pos + meta_len])
+        self.category_names = meta["categories"]
+        self._digest = meta.get("digest")
+        pos += meta_len
+        self.category_codes = array("H")
+        self.category_codes.frombytes(self._mm[pos:pos + 2 * count])
+        if sys.byteorder == "big":
+            self.category_codes.byteswap()
+        self._count = count
+        self._offsets_at = pos + 2 * count
+        self._text_at = self._offsets_at + _OFFSET.size * (count + 1)
+        self._record = lru_cache(maxsize=cache_size)(self._read_record)
+
+    def content_digest(self) -> str:
+        """
+        The content hash write_bank stored in the header, so a cold start does not
+        read the whole file. Files written without one fall back to size and mtime.
+        """
+        if self._digest:
+            return self._digest
+        st = os.stat(self.path)
+        return hashlib.sha256(f"{self.path}:{st.st_size}:{st.st_mtime_ns}".encode()).hexdigest()
+
+    def _read_record(self, qid: int) -> dict:
+        start, end = _SPAN.unpack_from(self._mm, self._offsets_at + _OFFSET.size * qid)
+        return json.loads(self._mm[self._text_at + start:self._text_at + end])
+
+    def text(self, qid: int) -> str:
+        return self._record(qid)["q"]
+
+    def answer(self, qid: int) -> str:
+        return self._record(qid)["a"]
+
+    def category(self, qid: int) -> str:
+        return self.category_names[self.category_codes[qid]]
+
+    def answer_key(self, qid: int):
+        return compile_answer(self.answer(qid), self._record(qid).get("tolerance"))
+
+    def extra(self, qid: int):
+        extra = {k: v for k, v in self._record(qid).items() if k not in ("q", "a")}
+        return extra or None
+
+    def __len__(self):
+        return self._count
+
+def open_bank(path: str) -> MappedQuestionStore:
+    return MappedQuestionStore(path)
+
+def _read_jsonl(path: str):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def main(argv) -> None:
+    if not 1 <= len(argv) <= 2:
+        sys.exit("usage: python bank_file.py OUT.tqb [SOURCE.jsonl]")
+    if len(argv) == 2:
+        source = _read_jsonl(argv[1])
+    else:
+        from question_bank import QUESTIONS
+        source = (dict(q) for q in QUESTIONS)
+    n = write_bank(source, argv[0])
+    print(f"wrote {n} questions to {argv[0]}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,172 @@
+# bank_lint.py
+"""
+Bank lint: near-duplicate questions and conflicting answers, in sub-quadratic
+time so it can run on every import of a 100k+ question bank.
+
+    python bank_lint.py                      # the built-in bank
+    python bank_lint.py bank.jsonl           # or a .tqb file
+    python bank_lint.py bank.jsonl --threshold 0.6 --strict   # exit 1 on findings
+
+Each question is normalized (grading.normalize), stripped of question words
+and turned into a set of character 4-gram shingles. A MinHash signature of
+SIGNATURE_SIZE values is built with one-permutation hashing: one crc32 per
+shingle, binned, with empty bins filled from other bins. The signature is
+cut into bands of ROWS values (locality-sensitive hashing). Only questions
+that share a band bucket are compared, by exact Jaccard similarity. With 32 x 4
+a pair at similarity 0.5 is a candidate ~87% of the time, at 0.1 ~0.3%.
+Questions with the same answer get a second, looser pass (64 x 2 within each
+answer) to catch rewordings below the near-duplicate threshold.
+
+Reported:
+  duplicates  similar questions whose answers agree (one of them can go)
+  conflicts   similar questions whose answers disagree (a key is wrong, or the
+              questions only look alike; review by hand)
+  same answer questions with the same normalized answer that also share
+              wording, below the near-duplicate threshold
+"""
+
+import argparse, random, sys, zlib
+from array import array
+from functools import lru_cache
+from collections import Counter
+from itertools import combinations
+from grading import compile_answer, is_correct, normalize
+
+SHINGLE = 4
+SIGNATURE_SIZE = 128
+ROWS = 4                   # 32 bands of 4
+THRESHOLD = 0.5            # Jaccard similarity for a near-duplicate
+SAME_ANSWER_ROWS = 2       # 64 bands of 2: a looser net, only within one answer
+SAME_ANSWER_THRESHOLD = 0.25
+_MASK = 0xFFFFFFFF
+_FILL_STEP = 0x9E3779B1    # odd constant: filled bins differ from the bin they copy
+# Fixed pseudo-random donor order per bin for densification; copying from a
+# fixed neighbour instead would make the rows of a band move together
+_rng = random.Random(20240901)
+_DONORS = [[k for k in _rng.sample(range(SIGNATURE_SIZE), SIGNATURE_SIZE) if k != b]
+           for b in range(SIGNATURE_SIZE)]
+del _rng
+
+STOPWORDS = frozenset(
+    "a an the of in on at to for by is was are were what which who whom whose when where why how "
+    "did does do and or with from as its it this that these those has have had be been name known".split())
+
+def shingles(text: str) -> frozenset:
+    words = [w for w in normalize(text).split() if w not in STOPWORDS]
+    s = " ".join(words)
+    if len(s) <= SHINGLE:
+        return frozenset((s,)) if s else frozenset()
+    return frozenset(s[i:i + SHINGLE] for i in range(len(s) - SHINGLE + 1))
+
+def signature(shingle_set) -> bytes:
+    """
+    One-permutation MinHash: min hash per bin, each empty bin filled from the
+    first non-empty bin in its donor order. Packed as 4 bytes per bin (512 bytes per question); b"" if no shingles.
+    """
+    bins = [None] * SIGNATURE_SIZE
+    for sh in shingle_set:
+        h = zlib.crc32(sh.encode("utf-8"))
+        b, v = h % SIGNATURE_SIZE, h // SIGNATURE_SIZE
+        if bins[b] is None or v < bins[b]:
+            bins[b] = v
+    if not shingle_set:
+        return b""
+    filled = list(bins)
+    for b in range(SIGNATURE_SIZE):
+        if bins[b] is None:
+            for step, k in enumerate(_DONORS[b], start=1):
+                if bins[k] is not None:
+                    filled[b] = (bins[k] + step * _FILL_STEP) & _MASK
+                    break
+    return array("I", filled).tobytes()
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+def candidate_pairs(signatures, rows: int = ROWS, groups=None):
+    """
+    Pairs (i, j), i < j, that share at least one LSH band bucket. With groups,
+    only items with the same non-None groups[qid] are paired.
+    """
+    pairs = set()
+    width = 4 * rows
+    for lo in range(0, 4 * SIGNATURE_SIZE - width + 1, width):
+        buckets = {}
+        for qid, sig in enumerate(signatures):
+            if not sig:
+                continue
+            if groups is None:
+                buckets.setdefault(sig[lo:lo + width], []).append(qid)
+            elif groups[qid] is not None:
+                buckets.setdefault((groups[qid], sig[lo:lo + width]), []).append(qid)
+        for members in buckets.values():
+            if len(members) > 1:
+                pairs.update(combinations(members, 2))
+    return pairs
+
+def answers_agree(a: str, b: str) -> bool:
+    return is_correct(a, compile_answer(b)) or is_correct(b, compile_answer(a))
+
+def lint(questions, threshold: float = THRESHOLD):
+    """Returns (duplicates, conflicts, same_answer): lists of (similarity, qid, qid)."""
+    # Only signatures are kept for the whole bank; shingle sets are rebuilt for
+    # the (few) candidates, through a bounded cache
+    signatures = [signature(shingles(questions.text(qid))) for qid in range(len(questions))]
+    sets = lru_cache(maxsize=4096)(lambda qid: shingles(questions.text(qid)))
+    duplicates, conflicts = [], []
+    for i, j in sorted(candidate_pairs(signatures)):
+        sim = jaccard(sets(i), sets(j))
+        if sim >= threshold:
+            same = answers_agree(questions.answer(i), questions.answer(j))
+            (duplicates if same else conflicts).append((sim, i, j))
+
+    answers = [normalize(questions.answer(qid)) for qid in range(len(questions))]
+    counts = Counter(answers)
+    groups = [a if counts[a] > 1 else None for a in answers]
+    same_answer = []
+    for i, j in sorted(candidate_pairs(signatures, SAME_ANSWER_ROWS, groups)):
+        sim = jaccard(sets(i), sets(j))
+        if SAME_ANSWER_THRESHOLD <= sim < threshold:
+            same_answer.append((sim, i, j))
+    for found in (duplicates, conflicts, same_answer):
+        found.sort(key=lambda t: (-t[0], t[1], t[2]))
+    return duplicates, conflicts, same_answer
+
+def _load(path: str):
+    if path.endswith(".tqb"):
+        from bank_file import open_bank
+        return open_bank(path)
+    if path.endswith(".jsonl"):
+        from bank_file import _read_jsonl
+        from question_store import QuestionStore
+        return QuestionStore.from_dicts(list(_read_jsonl(path)), compile_keys=False)
+    raise SystemExit(f"unsupported bank file {path!r} (expected .tqb or .jsonl)")
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("bank", nargs="?", help=".tqb or .jsonl file (default: question_bank.QUESTIONS)")
+    ap.add_argument("--threshold", type=float, default=THRESHOLD)
+    ap.add_argument("--strict", action="store_true", help="exit 1 if duplicates or conflicts are found")
+    args = ap.parse_args(argv)
+
+    if args.bank:
+        questions = _load(args.bank)
+    else:
+        from question_bank import QUESTIONS as questions
+    duplicates, conflicts, same_answer = lint(questions, args.threshold)
+
+    def show(title, found):
+        print(f"{title} ({len(found)}):")
+        for sim, i, j in found:
+            print(f"  {sim:.2f}  [{i}] {questions.text(i)}  ->  {questions.answer(i)}")
+            print(f"        [{j}] {questions.text(j)}  ->  {questions.answer(j)}")
+        print()
+    print(f"{len(questions)} questions, near-duplicate threshold {args.threshold}\n")
+    show("Near-duplicate questions", duplicates)
+    show("Conflicting answers", conflicts)
+    show("Same answer, similar wording", same_answer)
+    return 1 if args.strict and (duplicates or conflicts) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
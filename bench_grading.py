@@ -0,0 +1,158 @@
+# bench_grading.py
+"""
+Latency/throughput benchmark for grading (grading.py imports without Streamlit).
+
+    python bench_grading.py                              # report
+    python bench_grading.py --save bench_baseline.json   # record a baseline
+    python bench_grading.py --compare bench_baseline.json --max-slowdown 15
+
+Corpora are built from the answers in question_bank.QUESTIONS, one per grading
+path: exact hits, alias hits ("usa" for "United States"), number words
+("twenty one"), typos, and reordered multi-part answers ("gold and blue").
+Answer keys are precompiled (as in the app); the normalize() and parse_numeric()
+caches are cleared before every timed call so each user input is graded cold.
+
+--compare exits with status 1 if any path's median latency is more than
+--max-slowdown percent above the baseline.
+"""
+
+import argparse, json, random, statistics, sys, time
+import grading
+from grading import compile_answer, is_correct, normalize
+from numeric import parse_numeric
+from question_bank import QUESTIONS
+
+_ONES = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+         "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen",
+         "eighteen", "nineteen"]
+_TENS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+
+def spell(n: int) -> str:
+    """Number to words in the style _words_to_int understands ('twenty one')."""
+    if n < 20:
+        return _ONES[n]
+    if n < 100:
+        return _TENS[n // 10] + ("" if n % 10 == 0 else " " + _ONES[n % 10])
+    for scale, word in ((1_000_000_000, "billion"), (1_000_000, "million"), (1000, "thousand"), (100, "hundred")):
+        if n >= scale:
+            head, rest = divmod(n, scale)
+            return f"{spell(head)} {word}" + ("" if rest == 0 else " " + spell(rest))
+    raise AssertionError(n)
+
+def typo(s: str, rng: random.Random) -> str:
+    if len(s) < 5:
+        return s
+    i = rng.randrange(1, len(s) - 2)
+    return s[:i] + s[i + 1] + s[i] + s[i + 2:]  # swap two neighbours
+
+def build_corpora(rng: random.Random) -> dict:
+    corpora = {"exact": [], "alias": [], "number_words": [], "typo": [], "multi_part": [], "miss": []}
+    variants, _canon = grading.alias_tables()
+    answers = [q["a"] for q in QUESTIONS]
+    for a in answers:
+        key = compile_answer(a)
+        corpora["exact"].append((a.lower(), key))
+        corpora["typo"].append((typo(a, rng), key))
+        corpora["miss"].append((rng.choice(answers), key))
+        for v in sorted(variants.get(key.norm, ())):
+            corpora["alias"].append((v, key))
+        if len(key.numeric) == 1 and key.numeric[0].kind == "num" and isinstance(key.numeric[0].lo, int):
+            corpora["number_words"].append((spell(key.numeric[0].lo), key))
+        if key.multi_parts:
+            parts = [p for p, _k in key.multi_parts]
+            rng.shuffle(parts)
+            corpora["multi_part"].append((" and ".join(parts), key))
+    # Aliased answers that aren't in the bank still exercise the alias path
+    for canonical in ("United States", "New York City", "United Kingdom"):
+        key = compile_answer(canonical)
+        for v in sorted(variants.get(key.norm, ())):
+            corpora["alias"].append((v, key))
+    return corpora
+
+def time_path(pairs, repeat: int) -> list:
+    samples = []
+    clock = time.perf_counter_ns
+    for _ in range(repeat):
+        for user, key in pairs:
+            normalize.cache_clear()
+            parse_numeric.cache_clear()
+            t0 = clock()
+            is_correct(user, key)
+            samples.append(clock() - t0)
+    return samples
+
+def time_normalize(strings, repeat: int) -> list:
+    samples = []
+    clock = time.perf_counter_ns
+    for _ in range(repeat):
+        for s in strings:
+            normalize.cache_clear()
+            t0 = clock()
+            normalize(s)
+            samples.append(clock() - t0)
+    return samples
+
+def summarize(samples) -> dict:
+    q = statistics.quantiles(samples, n=100, method="inclusive")
+    total_s = sum(samples) / 1e9
+    return {
+        "n": len(samples),
+        "p50_us": q[49] / 1000,
+        "p90_us": q[89] / 1000,
+        "p99_us": q[98] / 1000,
+        "per_sec": len(samples) / total_s if total_s else float("inf"),
+    }
+
+def run(repeat: int, seed: int) -> dict:
+    corpora = build_corpora(random.Random(seed))
+    results = {}
+    for path, pairs in corpora.items():
+        if pairs:
+            time_path(pairs[:50], 1)  # warm-up
+            results[path] = summarize(time_path(pairs, repeat))
+    raw = [user for pairs in corpora.values() for user, _key in pairs]
+    results["normalize"] = summarize(time_normalize(raw, repeat))
+    return results
+
+def report(results: dict) -> None:
+    print(f"{'path':<14} {'n':>7} {'p50 µs':>9} {'p90 µs':>9} {'p99 µs':>9} {'ops/s':>10}")
+    for path, r in results.items():
+        print(f"{path:<14} {r['n']:>7} {r['p50_us']:>9.1f} {r['p90_us']:>9.1f} {r['p99_us']:>9.1f} {r['per_sec']:>10.0f}")
+
+def compare(results: dict, baseline: dict, max_slowdown: float) -> list:
+    regressions = []
+    for path, base in baseline.items():
+        cur = results.get(path)
+        if cur is None:
+            continue
+        change = (cur["p50_us"] / base["p50_us"] - 1) * 100 if base["p50_us"] else 0.0
+        if change > max_slowdown:
+            regressions.append(f"{path}: p50 {base['p50_us']:.1f} -> {cur['p50_us']:.1f} µs (+{change:.0f}%)")
+    return regressions
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--save", metavar="FILE", help="write results as a baseline")
+    ap.add_argument("--compare", metavar="FILE", help="fail on regressions against a baseline")
+    ap.add_argument("--max-slowdown", type=float, default=15.0, help="allowed p50 increase in percent")
+    args = ap.parse_args(argv)
+
+    results = run(args.repeat, args.seed)
+    report(results)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.max_slowdown)
+        if regressions:
+            print("\nREGRESSION (more than {:.0f}% slower):".format(args.max_slowdown))
+            print("\n".join("  " + r for r in regressions))
+            return 1
+        print(f"\nno path slower than {args.max_slowdown:.0f}% vs {args.compare}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+# bench_session.py
+"""
+Per-session memory of a finished game: copied question dicts (old layout) vs
+game.GameSession (integer ids, deques, byte flags and the seen bitset).
+
+    python bench_session.py          # 50-question game
+    python bench_session.py 200
+
+"pickled" is what Streamlit serializes for the session; "held" is what the
+restored session keeps alive beyond the shared bank (tracemalloc while
+unpickling it).
+"""
+
+import pickle, random, sys, tracemalloc
+from types import SimpleNamespace
+from question_bank import QUESTIONS
+from game import GameSession
+
+def old_layout(qids, answers, verdicts):
+    ss = SimpleNamespace()
+    ss.order = [{"uid": f"q{i}", "q": QUESTIONS[qid]["q"], "a": QUESTIONS[qid]["a"],
+                 "category": QUESTIONS[qid]["category"]} for i, qid in enumerate(qids)]
+    ss.history = [{"q": q["q"], "user": user, "correct": q["a"], "is_correct": ok}
+                  for q, user, ok in zip(ss.order, answers, verdicts)]
+    ss.skipped_once = {q["uid"] for q in ss.order[::5]}
+    return vars(ss)
+
+def game_session(qids, answers, verdicts):
+    # Verdicts are fixed up front so grading does not affect the measurement
+    by_qid = dict(zip(qids, verdicts))
+    game = GameSession(grade=lambda qid, _user, _key: by_qid[qid])
+    game.start_with(qids)
+    for k, answer in enumerate(answers):
+        if k % 5 == 0:
+            game.skip()
+        game.submit(answer)
+    return game
+
+def measure(state):
+    blob = pickle.dumps(state)
+    tracemalloc.start()
+    restored = pickle.loads(blob)
+    held, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del restored
+    return held, len(blob)
+
+def main(n: int):
+    rng = random.Random(0)
+    qids = rng.sample(range(len(QUESTIONS)), k=min(n, len(QUESTIONS)))
+    answers = [f"my answer {i}" for i in range(len(qids))]  # user text is needed either way
+    verdicts = [rng.random() < 0.7 for _ in qids]
+    print(f"{len(qids)}-question game")
+    for name, build in (("copied dicts", old_layout), ("GameSession", game_session)):
+        held, pickled = measure(build(qids, answers, verdicts))
+        print(f"  {name:<14} held {held / 1024:7.1f} KB   pickled {pickled / 1024:7.1f} KB")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
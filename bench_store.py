@@ -0,0 +1,65 @@
+# bench_store.py
+"""
+Resident memory of the question bank: list-of-dicts vs QuestionStore.
+
+    python bench_store.py              # 10k and 100k synthetic questions
+    python bench_store.py 5000 50000
+
+Each measurement runs in a fresh interpreter so the numbers don't bleed into
+each other. Answer keys are not compiled in either layout (pure storage cost).
+"""
+
+import gc, os, subprocess, sys
+
+CATEGORY_POOL = ["Geography", "History", "Science", "Movies", "Music", "Sports",
+                 "Television", "Celebrities", "Tech", "Video Games", "Pop Culture",
+                 "Social Media", "K-Pop and Dramas", "Fashion and Trends"]
+
+def synthetic(n: int):
+    for i in range(n):
+        yield {
+            "q": f"Synthetic trivia question number {i}: which answer matches entry {i * 7919 % 100003}?",
+            "a": f"Answer {i}",
+            "category": CATEGORY_POOL[i % len(CATEGORY_POOL)],
+        }
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:  # not Linux: fall back to peak RSS
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+def _measure(layout: str, n: int) -> int:
+    from question_store import QuestionStore
+    gc.collect()
+    before = rss_bytes()
+    if layout == "dicts":
+        bank = list(synthetic(n))
+    else:
+        bank = QuestionStore(compile_keys=False)
+        for q in synthetic(n):
+            bank.append(q["q"], q["a"], q["category"])
+    gc.collect()
+    after = rss_bytes()
+    assert len(bank) == n
+    return after - before
+
+def main(sizes):
+    print(f"{'questions':>10} {'list of dicts':>15} {'QuestionStore':>15} {'saved':>8}")
+    for n in sizes:
+        res = {}
+        for layout in ("dicts", "store"):
+            out = subprocess.run([sys.executable, __file__, "--measure", layout, str(n)],
+                                 check=True, capture_output=True, text=True)
+            res[layout] = int(out.stdout)
+        saved = 1 - res["store"] / res["dicts"] if res["dicts"] else 0.0
+        print(f"{n:>10} {res['dicts'] / 2**20:>12.1f} MB {res['store'] / 2**20:>12.1f} MB {saved:>7.0%}")
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--measure"]:
+        print(_measure(sys.argv[2], int(sys.argv[3])))
+    else:
+        main([int(a) for a in sys.argv[1:]] or [10_000, 100_000])
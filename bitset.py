@@ -0,0 +1,36 @@
+# bitset.py
+"""
+Question-id sets as plain Python ints: bit q is set when question q is in the
+set. One bit per question, and union/intersection/difference run in C over
+machine words, so their cost depends on the bank size, not on how many games
+built the set.
+"""
+
+def from_ids(ids) -> int:
+    """Bitset of the given question ids."""
+    flags = bytearray()
+    for q in ids:
+        byte = q >> 3
+        if byte >= len(flags):
+            flags.extend(bytes(byte + 1 - len(flags)))
+        flags[byte] |= 1 << (q & 7)
+    return int.from_bytes(flags, "little")
+
+def ids(bits: int) -> list:
+    """Set question ids, ascending."""
+    s = bin(bits)[:1:-1]  # least significant bit first
+    out, i = [], s.find("1")
+    while i >= 0:
+        out.append(i)
+        i = s.find("1", i + 1)
+    return out
+
+def contains(bits: int, q: int) -> bool:
+    return bits >> q & 1 == 1
+
+def to_bytes(bits: int) -> bytes:
+    """Little-endian bytes for storage (about one bit per question)."""
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+def from_bytes(data: bytes) -> int:
+    return int.from_bytes(data or b"", "little")
@@ -0,0 +1,73 @@
+# categories.py
+
+from typing import NamedTuple
+from question_bank import QUESTIONS
+
+# ---------------- Category folding (treat these as Pop Culture) ----------------
+CATEGORY_FOLD = {
+    # existing
+    "Celebrities": "Pop Culture",
+    "Fashion and Trends": "Pop Culture",
+    "Tech": "Pop Culture",
+    "Sports and Athletes": "Pop Culture",
+    "Video Games": "Pop Culture",
+    "Literature and Books": "Pop Culture",
+    "Comics and Superheroes": "Pop Culture",
+    # new → Pop Culture
+    "Movies": "Pop Culture",
+    "Film": "Pop Culture",
+    "Television": "Pop Culture",
+    "TV": "Pop Culture",
+    "TV Shows": "Pop Culture",
+    "Anime": "Pop Culture",
+    "K-Pop and Dramas": "Pop Culture",
+    "K-Pop": "Pop Culture",
+    "Korean Dramas": "Pop Culture",
+    "Social Media": "Pop Culture",
+    "Music": "Pop Culture",
+    "Pop culture trivia questions and answers": "Pop Culture",
+}
+_FOLD_NORM = {k.lower(): v for k, v in CATEGORY_FOLD.items()}
+
+def fold(cat: str) -> str:
+    key = (cat or "").strip()
+    return _FOLD_NORM.get(key.lower(), key)
+
+# ---------------- Category index (built once per process) ----------------
+class CategoryIndex(NamedTuple):
+    all_ids: tuple   # every question id (index into QUESTIONS)
+    ids: dict        # folded category -> tuple of question ids
+    counts: dict     # folded category -> number of questions
+    names: tuple     # folded categories, sorted
+
+def build_category_index(questions=QUESTIONS) -> CategoryIndex:
+    folded = [fold(name) for name in questions.category_names]  # fold each distinct name once
+    buckets = {}
+    for qid, code in enumerate(questions.category_codes):
+        buckets.setdefault(folded[code], []).append(qid)
+    ids = {cat: tuple(qids) for cat, qids in buckets.items()}
+    return CategoryIndex(
+        all_ids=tuple(range(len(questions))),
+        ids=ids,
+        counts={cat: len(qids) for cat, qids in ids.items()},
+        names=tuple(sorted(ids)),
+    )
+
+_INDEX = None
+
+def category_index() -> CategoryIndex:
+    """Process-wide index, shared by every session; built on first use."""
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = build_category_index()
+    return _INDEX
+
+def install_category_index(index: CategoryIndex) -> None:
+    """Adopt a previously built index (see bank_cache)."""
+    global _INDEX
+    _INDEX = index
+
+def invalidate_category_index() -> None:
+    """Call after QUESTIONS or CATEGORY_FOLD change; the next lookup rebuilds."""
+    global _INDEX
+    _INDEX = None
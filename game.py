@@ -0,0 +1,283 @@
+# game.py
+"""
+Headless game engine. GameSession holds one player's game (start, submit, skip,
+quit, score) with no UI dependency, so the Streamlit app, a CLI, an HTTP
+service or a load test can all drive it.
+
+    python game.py ["Pop Culture"] [10]      # play in the terminal
+"""
+
+import math, random, sys, time, uuid
+from array import array
+from collections import deque
+from typing import NamedTuple
+from question_bank import QUESTIONS
+from grading import VERDICT_CACHE
+from categories import fold, category_index
+from sampler import question_sampler, player_weights, UNIFORM, MISSED
+import bitset
+
+# ---------------- Settings ----------------
+PASS_THRESHOLD = 0.70  # 70%
+MIX_LABEL = "All Categories (Mix)"
+MAX_BASE = 50
+MARATHON_MAX = 500  # cap when the player opts into a marathon game
+MIN_QUESTIONS = 5
+
+def pool_for_category(category: str):
+    """Question ids (indexes into QUESTIONS) available in a category."""
+    cat = fold(category)
+    index = category_index()
+    if cat == MIX_LABEL:
+        return index.all_ids
+    return index.ids.get(cat, ())
+
+class Score(NamedTuple):
+    right: int
+    total: int
+    needed: int
+    pct: float
+    passed: bool
+
+class GameSession:
+    """
+    One player's game, kept compact: only integer ids and byte flags. Question
+    text/answers are looked up in the shared question store when needed.
+
+    Play order is a main queue of slots followed by a revisit queue of skipped
+    slots, so skip, advance and every render-time query are O(1) whatever the
+    game length.
+
+    seen is a bitset (see bitset.py) of every question the player has answered,
+    kept across games: start() draws only unseen questions until the category
+    runs out, then forgets that category and starts over.
+
+    With a results store (results_store.ResultsStore) every answer, skip and
+    final score is recorded, and a named player's seen bitset is loaded and
+    saved, so it carries across sessions. A leaderboard (leaderboard.Leaderboard)
+    is given each finished game, and analytics (analytics.QuestionAnalytics) each
+    answer and skip.
+
+    Pickling keeps only the game's plain data (_STATE); the services (bank,
+    grader, sampler, stores) are process objects, so an unpickled session gets
+    the defaults and the app re-attaches its stores with attach() on every run.
+    """
+    _SERVICES = ("questions", "grade", "sampler", "results", "leaderboard", "analytics")
+    _STATE = ("seen", "player", "category", "started", "game_id", "started_at",
+              "qids", "queue", "revisit", "answered", "answers", "verdicts", "idx")
+    __slots__ = _SERVICES + _STATE + ("shown_at",)  # shown_at: monotonic, this process only
+
+    def __init__(self, questions=QUESTIONS, grade=VERDICT_CACHE.grade, sampler=None,
+                 seen: int = 0, results=None, leaderboard=None, analytics=None,
+                 player: str = ""):
+        self.questions = questions
+        self.grade = grade          # grade(qid, user_answer, answer_key) -> bool
+        self.sampler = sampler      # AdaptiveSampler; None = the process-wide one (seeded from results)
+        self.seen = seen            # bit q set once question q has been answered
+        self.results = results      # ResultsStore or None (record nothing)
+        self.leaderboard = leaderboard
+        self.analytics = analytics
+        self.player = player        # "" = anonymous
+        self.category = MIX_LABEL
+        self.quit()
+
+    def attach(self, results=None, leaderboard=None, analytics=None) -> None:
+        """(Re)connect the shared stores, e.g. after the session was unpickled."""
+        self.results = results
+        self.leaderboard = leaderboard
+        self.analytics = analytics
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self._STATE}
+
+    def __setstate__(self, state) -> None:
+        self.questions, self.grade, self.sampler = QUESTIONS, VERDICT_CACHE.grade, None
+        self.attach()
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.shown_at = time.monotonic()
+
+    def set_player(self, name: str) -> None:
+        """
+        Switch to a named player, loading their seen questions from the results
+        store. A blank name switches back to anonymous with nothing seen.
+        """
+        name = (name or "").strip()
+        if name == self.player:
+            return
+        self.player = name
+        self.seen = 0
+        if name and self.results is not None:
+            self.seen = bitset.from_bytes(self.results.load_seen(name))
+
+    # ---- lifecycle ----
+    def start(self, category: str = MIX_LABEL, num_questions: int = 10,
+              allow_repeats: bool = False, rng=random, mode: str = UNIFORM) -> None:
+        """mode: sampler.UNIFORM, HARDEST (miss rate across players) or MISSED (this player's)."""
+        pool = pool_for_category(category)
+        if not pool:
+            raise ValueError(f"no questions in category {category!r}")
+        if not allow_repeats and num_questions > len(pool):
+            raise ValueError(f"only {len(pool)} question(s) in {category!r}")
+        # With repeats the count can exceed the pool size
+        cat = fold(category)
+        key = None if cat == MIX_LABEL else cat
+        sampler = self._sampler()
+        weights = player_weights(self.results, self.player) if mode == MISSED else None
+        draw = lambda k, **kw: sampler.sample(key, k, rng, mode=mode, weights=weights, **kw)
+        if allow_repeats:
+            qids = draw(num_questions, replace=True)
+        else:
+            pool = sampler.mask(key)
+            fresh = pool & ~self.seen
+            if fresh.bit_count() >= num_questions:
+                qids = draw(num_questions, exclude=self.seen)
+            else:
+                # Category exhausted: use up what's left unseen, then start it over
+                self.seen &= ~pool
+                qids = bitset.ids(fresh)
+                qids += draw(num_questions - len(qids), exclude=fresh)
+                rng.shuffle(qids)
+        self.start_with(qids, category)
+
+    def _sampler(self):
+        return self.sampler or question_sampler(self.results)
+
+    def start_with(self, qids, category: str = MIX_LABEL) -> None:
+        """Start a game over the given question ids (in play order)."""
+        self._reset(qids)
+        self.category = category
+        self.started = True
+        self.game_id = uuid.uuid4().hex
+        self.started_at = time.time()
+
+    def quit(self) -> None:
+        self._reset(())
+        self.started = False
+
+    def _reset(self, qids) -> None:
+        self.game_id = ""
+        self.started_at = 0.0
+        self.shown_at = time.monotonic()      # when the current question appeared
+        # Slots give repeated questions distinct identities for skipping
+        self.qids = array("I", qids)          # question id per slot, in draw order
+        self.queue = deque(range(len(qids)))  # slots not yet answered or skipped, in play order
+        self.revisit = deque()                # skipped slots, replayed once the main queue is empty
+        self.answered = array("I")            # slots in the order they were answered
+        self.answers = []                     # user's text for each answered slot
+        self.verdicts = bytearray()           # 1 when the k-th answer was correct
+        self.idx = 0
+
+    # ---- current question ----
+    @property
+    def total(self) -> int:
+        return len(self.qids)
+
+    @property
+    def position(self) -> int:
+        """0-based number of the current question (== answers given so far)."""
+        return self.idx
+
+    @property
+    def finished(self) -> bool:
+        return self.started and not (self.queue or self.revisit)
+
+    def _slot(self):
+        return self.queue[0] if self.queue else self.revisit[0]
+
+    def current(self):
+        """The current question (a Question view), or None once the game is over."""
+        if not (self.queue or self.revisit):
+            return None
+        return self.questions[self.qids[self._slot()]]
+
+    def can_skip(self) -> bool:
+        # Revisited questions have been skipped already
+        return bool(self.queue)
+
+    @property
+    def pending_skips(self) -> int:
+        """Skipped questions still to be answered (including the current one)."""
+        return len(self.revisit)
+
+    # ---- actions ----
+    def submit(self, answer: str) -> bool:
+        """Grade the current question and advance; returns the verdict."""
+        if not (answer or "").strip():
+            raise ValueError("blank answer")
+        slot = (self.queue or self.revisit).popleft()
+        qid = self.qids[slot]
+        ok = self.grade(qid, answer, self.questions[qid]["key"])
+        self._sampler().record(qid, ok)
+        self.seen |= 1 << qid
+        self.verdicts.append(ok)
+        self.answered.append(slot)
+        self.answers.append(answer)
+        self.idx += 1
+        now = time.monotonic()
+        if self.results is not None:
+            self.results.record_answer(self.game_id, self.player, qid, answer, ok, now - self.shown_at)
+        if self.analytics is not None:
+            self.analytics.record_answer(qid, answer, ok, now - self.shown_at)
+        if self.finished:
+            self._finish()
+        self.shown_at = now
+        return ok
+
+    def _finish(self) -> None:
+        score = self.score()
+        if self.results is not None:
+            self.results.record_game(self.game_id, self.player, self.category, self.started_at, score)
+            if self.player:
+                self.results.save_seen(self.player, bitset.to_bytes(self.seen))
+        if self.leaderboard is not None:
+            self.leaderboard.record_game(self.player, self.category, score.right, score.total, self.verdicts)
+
+    def skip(self) -> bool:
+        """Move the current question to the end (once per question); False if not allowed."""
+        if not self.can_skip():
+            return False
+        slot = self.queue.popleft()
+        self.revisit.append(slot)
+        if self.results is not None:
+            self.results.record_skip(self.game_id, self.player, self.qids[slot])
+        if self.analytics is not None:
+            self.analytics.record_skip(self.qids[slot])
+        self.shown_at = time.monotonic()
+        # idx stays put so the next question slides into this position
+        return True
+
+    # ---- results ----
+    def score(self, threshold: float = PASS_THRESHOLD) -> Score:
+        right = self.verdicts.count(1)
+        total = len(self.qids)
+        needed = math.ceil(total * threshold)
+        pct = (right / total) * 100 if total else 0.0
+        return Score(right, total, needed, pct, right >= needed)
+
+    def review(self):
+        """(question, user answer, verdict) for each answer, in the order given."""
+        for k, (slot, user) in enumerate(zip(self.answered, self.answers)):
+            yield self.questions[self.qids[slot]], user, bool(self.verdicts[k])
+
+def main(argv) -> None:
+    category = argv[0] if argv else MIX_LABEL
+    n = int(argv[1]) if len(argv) > 1 else 10
+    game = GameSession()
+    game.start(category, min(n, len(pool_for_category(category))))
+    while not game.finished:
+        q = game.current()
+        print(f"\nQuestion {game.position + 1} of {game.total}: {q['q']}")
+        answer = input("Your answer (blank = skip, 'quit' = quit): ").strip()
+        if answer.lower() == "quit":
+            return
+        if not answer:
+            if not game.skip():
+                print("Already skipped once; please answer.")
+            continue
+        print("✅ Correct!" if game.submit(answer) else f"❌ The answer was: {q['a']}")
+    s = game.score()
+    print(f"\nGame over! Your score: {s.right}/{s.total} ({s.pct:.2f}%)")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,530 @@
+# grading.py
+
+import re, difflib, math, os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import NamedTuple
+from numeric import words_to_int as _words_to_int
+from numeric import Tolerance, mostly_numeric, numeric_match, parse_numeric, parse_tolerance
+from textfold import FOLD_TABLE
+
+_OPTION_SPLIT_RE = re.compile(r"\s*(?:\band\b|,|/|;)\s*", flags=re.I)
+_ANY_OF_SPLIT_RE = re.compile(r"\bor\b|,|/|;")
+
+def _tokenize_options(s: str):
+    # split on "and", commas, slashes, semicolons
+    parts = _OPTION_SPLIT_RE.split(s.strip())
+    return [p for p in parts if p]
+
+# ---------------- Aliases ----------------
+ALIASES = {
+    "uk": {"united kingdom", "great britain", "britain"},
+    "netherlands": {"holland", "the netherlands"},
+    "robert downey jr": {"rdj", "robert downey junior"},
+    "pokemon go": {"pokemon-go"},
+    "stranger things": {"strangerthings"},
+    "united states": {"usa", "u s a", "u.s.", "us", "u.s.a", "united states of america"},
+    "new york city": {"nyc", "new york", "ny"},
+    "007": {"james bond", "bond"},
+    "bible": {"the bible", "holy bible"},
+
+    # States (two-letter)
+    "Alabama": {"AL"}, "Alaska": {"AK"}, "Arizona": {"AZ"}, "Arkansas": {"AR"},
+    "California": {"CA"}, "Colorado": {"CO"}, "Connecticut": {"CT"}, "Delaware": {"DE"},
+    "Florida": {"FL"}, "Georgia": {"GA"}, "Hawaii": {"HI"}, "Idaho": {"ID"},
+    "Illinois": {"IL"}, "Indiana": {"IN"}, "Iowa": {"IA"}, "Kansas": {"KS"},
+    "Kentucky": {"KY"}, "Louisiana": {"LA"}, "Maine": {"ME"}, "Maryland": {"MD"},
+    "Massachusetts": {"MA"}, "Michigan": {"MI"}, "Minnesota": {"MN"}, "Mississippi": {"MS"},
+    "Missouri": {"MO"}, "Montana": {"MT"}, "Nebraska": {"NE"}, "Nevada": {"NV"},
+    "New Hampshire": {"NH"}, "New Jersey": {"NJ"}, "New Mexico": {"NM"}, "New York": {"NY"},
+    "North Carolina": {"NC"}, "North Dakota": {"ND"}, "Ohio": {"OH"}, "Oklahoma": {"OK"},
+    "Oregon": {"OR"}, "Pennsylvania": {"PA"}, "Rhode Island": {"RI"}, "South Carolina": {"SC"},
+    "South Dakota": {"SD"}, "Tennessee": {"TN"}, "Texas": {"TX"}, "Utah": {"UT"},
+    "Vermont": {"VT"}, "Virginia": {"VA"}, "Washington": {"WA"}, "West Virginia": {"WV"},
+    "Wisconsin": {"WI"}, "Wyoming": {"WY"},
+
+    # DC (normalize strips punctuation)
+    "Washington, DC": {"DC", "Washington DC", "District of Columbia"},
+
+    # Countries / blocs
+    "United Kingdom": {"UK", "U.K.", "Great Britain", "Britain"},
+    "United Arab Emirates": {"UAE"},
+    "Soviet Union": {"USSR", "Union of Soviet Socialist Republics"},
+    "European Union": {"EU"},
+    "United Nations": {"UN"},
+    "Ivory Coast": {"Cote d'Ivoire"},
+    "Netherlands": {"Holland", "The Netherlands"},
+    "Myanmar": {"Burma"},
+    "Czechia": {"Czech Republic"},
+    "Eswatini": {"Swaziland"},
+    "Cape Verde": {"Cabo Verde"},
+    "East Timor": {"Timor-Leste", "Timor Leste"},
+    "South Korea": {"ROK", "Republic of Korea"},
+    "North Korea": {"DPRK", "Democratic People's Republic of Korea"},
+
+    # Major cities (nicknames)
+    "Los Angeles": {"LA", "L.A."},
+    "San Francisco": {"SF", "S.F.", "San Fran"},
+    "Philadelphia": {"Philly"}, "Las Vegas": {"Vegas"}, "New Orleans": {"NOLA"},
+    "Atlanta": {"ATL"}, "Saint Louis": {"St Louis", "St. Louis"},
+    "Saint Petersburg": {"St Petersburg", "St. Petersburg"},
+
+    # People / initials
+    "John F. Kennedy": {"JFK"}, "Franklin D. Roosevelt": {"FDR"},
+    "Martin Luther King Jr.": {"MLK", "Dr Martin Luther King Jr", "Dr. Martin Luther King Jr"},
+
+    # Entertainment shorthands
+    "Lord of the Rings": {"LOTR"}, "Game of Thrones": {"GOT"}, "Harry Potter": {"HP"},
+    "Back to the Future": {"BTTF"}, "AC/DC": {"ACDC"},
+}
+
+def alias_equiv(u_norm: str, correct_raw: str) -> bool:
+    return alias_match(u_norm, correct_raw)
+
+# ---------------- Number helpers (e.g., "six" == 6) ----------------
+_NUM_TOKEN_RE = re.compile(
+    r"\b(?:(?:zero|one|two|three|four|five|six|seven|eight|nine|ten|"
+    r"eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|"
+    r"twenty|thirty|forty|fifty|sixty|seventy|eighty|ninety|hundred|thousand|"
+    r"million|billion)(?:[\s-]+|$))+",
+    flags=re.I
+)
+
+def _replace_number_words(text: str) -> str:
+    def _sub(m):
+        n = _words_to_int(m.group(0))
+        return str(n) if n is not None else m.group(0)
+    return _NUM_TOKEN_RE.sub(_sub, text)
+
+_DIGIT_RUN_RE = re.compile(r"\d+")
+
+def _extract_numbers(s: str) -> tuple:
+    return tuple(int(x) for x in _DIGIT_RUN_RE.findall(s))
+
+# ---------------- Matching helpers ----------------
+# Patterns for normalize(), compiled once. Order of application matters.
+# Accents, quotes, dashes and odd spaces fold in the same pass as "&" (textfold)
+_SYMBOL_TABLE = {**FOLD_TABLE, ord("&"): "and"}
+_THOUSANDS_COMMA_RE = re.compile(r"(?<=\d),(?=\d{3}\b)")
+_MT_ST_RE = re.compile(r"\b(mt|st)\.?\s+")
+_MT_ST = {"mt": "mount ", "st": "saint "}
+_ABBREV2_RE = re.compile(r"\b([a-z])[\.\s]+([a-z])\b")
+_ABBREVN_RE = re.compile(r"\b([a-z])(?:[\.\s]+([a-z])){2,}\b")
+_ABBREV_SEP_RE = re.compile(r"[\.\s]+")
+_NON_WORD_RE = re.compile(r"\W+")  # punctuation -> space and whitespace collapse, one pass
+_DIGIT_GAP_RE = re.compile(r"(?<=\d)\s+(?=\d)")
+
+NORMALIZE_CACHE_SIZE = 16384
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize(s: str) -> str:
+    """
+    Lowercase, trim, fold accents and typographic punctuation ('Pokémon' -> 'pokemon',
+    '350–400', curly quotes); convert number words to digits; strip leading 'the'.
+    Also normalizes common number formats like '1,250' -> '1250' and '1 250' -> '1250'.
+
+    Results are memoized per raw string; see normalize.cache_info() for hit/miss counts.
+    """
+    s = (s or "").lower().strip().translate(_SYMBOL_TABLE)
+
+    # Remove thousands commas: '1,250' -> '1250'
+    s = _THOUSANDS_COMMA_RE.sub("", s)
+
+    # mt./st. → mount/saint
+    s = _MT_ST_RE.sub(lambda m: _MT_ST[m.group(1)], s)
+
+    # Collapse dotted/spacey abbreviations (u.s. -> us; n y -> ny)
+    s = _ABBREV2_RE.sub(r"\1\2", s)
+    s = _ABBREVN_RE.sub(lambda m: _ABBREV_SEP_RE.sub("", m.group(0)), s)
+
+    # Punctuation to spaces; collapse
+    s = _NON_WORD_RE.sub(" ", s).strip()
+
+    # Merge spaces between digits: '1 250' -> '1250'
+    s = _DIGIT_GAP_RE.sub("", s)
+
+    # Tolerate leading article 'the '
+    if s.startswith("the "):
+        s = s[4:]
+
+    # Convert number words to digits: 'six' -> '6'; 'twenty one' -> '21'
+    s = _replace_number_words(s)
+
+    return s
+
+# ---------------- Alias index (built once from ALIASES) ----------------
+_ALIAS_VARIANTS = {}  # normalized canonical -> set of normalized variants
+_ALIAS_CANON = {}     # normalized variant -> set of normalized canonicals
+
+def _index_alias(canonical: str, variants) -> None:
+    c_norm = normalize(canonical)
+    bucket = _ALIAS_VARIANTS.setdefault(c_norm, set())
+    for v in variants:
+        v_norm = normalize(v)
+        bucket.add(v_norm)
+        _ALIAS_CANON.setdefault(v_norm, set()).add(c_norm)
+
+_ALIAS_LISTENERS = []  # called after every alias index change
+
+def on_aliases_changed(callback) -> None:
+    """Run callback() after every alias index change (e.g. to drop an index built from it)."""
+    if callback not in _ALIAS_LISTENERS:
+        _ALIAS_LISTENERS.append(callback)
+
+def _aliases_changed() -> None:
+    # Anything derived from the alias index is stale now
+    compile_answer.cache_clear()
+    VERDICT_CACHE.clear()
+    for callback in _ALIAS_LISTENERS:
+        callback()
+
+def reload_aliases(aliases=None) -> None:
+    """
+    Rebuild the alias index. With no argument, re-reads ALIASES (use after editing it
+    in place); otherwise ALIASES is replaced by the given mapping first.
+    """
+    if aliases is not None:
+        ALIASES.clear()
+        ALIASES.update({k: set(v) for k, v in aliases.items()})
+    _ALIAS_VARIANTS.clear()
+    _ALIAS_CANON.clear()
+    for key, variants in ALIASES.items():
+        _index_alias(key, variants)
+    _aliases_changed()
+
+def add_alias(canonical: str, *variants: str) -> None:
+    """Register extra variants for a canonical answer (updates ALIASES and the index)."""
+    ALIASES.setdefault(canonical, set()).update(variants)
+    _index_alias(canonical, variants)
+    _aliases_changed()
+
+def alias_tables():
+    """The built index (canonical -> variants, variant -> canonicals), e.g. for caching."""
+    return _ALIAS_VARIANTS, _ALIAS_CANON
+
+def install_alias_tables(variants: dict, canon: dict) -> None:
+    """Adopt a previously built index (see bank_cache) instead of re-normalizing ALIASES."""
+    variants, canon = dict(variants), dict(canon)  # may be the live tables themselves
+    _ALIAS_VARIANTS.clear()
+    _ALIAS_VARIANTS.update(variants)
+    _ALIAS_CANON.clear()
+    _ALIAS_CANON.update(canon)
+    _aliases_changed()
+
+def alias_canonicals(variant: str) -> set:
+    """Normalized canonical answers a variant points to (empty set if none)."""
+    return set(_ALIAS_CANON.get(normalize(variant), ()))
+
+def alias_conflicts() -> dict:
+    """Variants claimed by more than one canonical, e.g. 'la' -> Louisiana and Los Angeles."""
+    return {v: sorted(cs) for v, cs in _ALIAS_CANON.items() if len(cs) > 1}
+
+def alias_match(user_norm: str, correct_raw: str) -> bool:
+    """If correct answer has a direct alias set, honor it."""
+    return user_norm in _ALIAS_VARIANTS.get(normalize(correct_raw), ())
+
+# ---------------- Fuzzy similarity backends ----------------
+def _difflib_similar(a: str, b: str, thresh: float) -> bool:
+    """
+    Compatibility backend: same accept/reject as SequenceMatcher.ratio() >= thresh.
+    real_quick_ratio (length bound) and quick_ratio (multiset bound) are upper bounds
+    on ratio(), so hopeless pairs are rejected before the full match.
+    """
+    sm = difflib.SequenceMatcher(None, a, b)
+    return sm.real_quick_ratio() >= thresh and sm.quick_ratio() >= thresh and sm.ratio() >= thresh
+
+def _bounded_edit_distance(a: str, b: str, k: int) -> int:
+    """
+    Insert/delete edit distance (a substitution costs 2) if it is <= k, else k + 1.
+    Uses the bit-parallel LCS recurrence (one big-int step per character of b) and
+    gives up as soon as the remaining characters can no longer bring it under k.
+    """
+    la, lb = len(a), len(b)
+    if abs(la - lb) > k:
+        return k + 1
+    masks = {}
+    for i, ch in enumerate(a):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    full = (1 << la) - 1
+    v = full
+    need = la + lb - k  # distance = la + lb - 2 * lcs, so 2 * lcs must reach this
+    for t, ch in enumerate(b, 1):
+        m = masks.get(ch)
+        if m:
+            x = v & m
+            v = ((v + x) | (v - x)) & full
+        if 2 * (la - v.bit_count() + lb - t) < need:
+            return k + 1
+    return la + lb - 2 * (la - v.bit_count())
+
+def _edit_distance_similar(a: str, b: str, thresh: float) -> bool:
+    """
+    Accept when 1 - distance / (len(a) + len(b)) >= thresh. That is the LCS ratio,
+    which SequenceMatcher.ratio() approximates, so the 0.80/0.88 thresholds carry over.
+    """
+    total = len(a) + len(b)
+    if not total:
+        return True
+    k = math.floor((1.0 - thresh) * total + 1e-9)
+    return _bounded_edit_distance(a, b, k) <= k
+
+SIMILARITY_BACKENDS = {
+    "difflib": _difflib_similar,
+    "edit_distance": _edit_distance_similar,
+}
+_similar = _edit_distance_similar
+
+def set_similarity_backend(name: str) -> None:
+    """
+    Choose the typo-tolerance backend used by is_correct.
+    'edit_distance' (default) is the fast bounded matcher; 'difflib' is the
+    compatibility mode and reproduces SequenceMatcher-era decisions exactly.
+    The two only disagree on borderline typos, where edit_distance is more lenient.
+    """
+    global _similar
+    try:
+        _similar = SIMILARITY_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"unknown similarity backend: {name!r}") from None
+    VERDICT_CACHE.clear()
+
+def register_similarity_backend(name: str, fn) -> None:
+    """Add a backend: fn(a, b, thresh) -> bool."""
+    SIMILARITY_BACKENDS[name] = fn
+
+# ---------------- Answer keys (correct side, compiled once) ----------------
+class AnswerKey(NamedTuple):
+    """
+    Everything is_correct needs from a correct answer, derived once.
+    Alias lookups stay live: parts carry the normalized key into the alias index,
+    not a snapshot of its variants, so add_alias/reload_aliases still apply.
+    """
+    raw: str
+    norm: str              # normalize(raw); also its alias-index key
+    numeric: tuple         # typed values (numeric.NumValue) when the answer is mostly numeric
+    digits: tuple          # otherwise the digit runs of norm ('m3gan 2 0' -> (3, 2, 0))
+    tolerance: Tolerance   # per-question numeric tolerance (exact by default)
+    multi_parts: tuple     # ((part, alias_key), ...) when the answer has several parts
+    options: tuple         # ((option, alias_key, fuzzy_threshold or None), ...)
+
+ANSWER_KEY_CACHE_SIZE = 4096
+
+def answer_options(c_norm: str) -> list:
+    """The alternatives of a normalized answer ("green or red" -> ["green", "red"])."""
+    return [p.strip() for p in _ANY_OF_SPLIT_RE.split(c_norm) if p.strip()] or [c_norm]
+
+@lru_cache(maxsize=ANSWER_KEY_CACHE_SIZE)
+def compile_answer(correct: str, tolerance=None) -> AnswerKey:
+    """
+    Pre-normalize a correct answer for repeated grading. `tolerance` is the
+    question's numeric tolerance ("10%", 5, "±5"; see numeric.parse_tolerance).
+    """
+    raw = correct or ""
+    c = normalize(raw)
+
+    c_parts = _tokenize_options(c)
+    multi_parts = tuple((b, normalize(b)) for b in c_parts) if len(c_parts) > 1 else ()
+
+    parts = answer_options(c)
+    options = tuple(
+        # very short answers require exact match
+        (p, normalize(p), None if len(p) <= 3 else (0.88 if len(p) <= 6 else 0.80))
+        for p in parts
+    )
+    # Typed values only where numbers are the answer; a title with digits in it
+    # ('M3GAN 2.0', '2 Cool 4 Skool') keeps the plain digit-sequence comparison
+    numeric = parse_numeric(raw) if mostly_numeric(raw) else ()
+    digits = () if numeric else _extract_numbers(c)
+    return AnswerKey(raw, c, numeric, digits, parse_tolerance(tolerance),
+                     multi_parts, options)
+
+def _alias_hit(u_norm: str, alias_key: str) -> bool:
+    return u_norm in _ALIAS_VARIANTS.get(alias_key, ())
+
+def is_correct(user: str, correct) -> bool:
+    """
+    Flexible match:
+    - Case/whitespace/punctuation-insensitive
+    - Optional leading 'The' (e.g., 'The Daily Planet' == 'Daily Planet')
+    - Number word ↔ digit equivalence ('six' == '6', 'twenty one' == '21')
+    - Accept any among 'or' / comma / slash / semicolon separated answers
+    - Order-insensitive for multi-part answers (e.g., 'Blue and Gold' == 'gold, blue')
+    - Alias-aware comparisons (e.g., 'us' ≈ 'united states')
+    - Fuzzy match for mild typos (length-adaptive threshold)
+    - If both sides contain numbers, the values must match (units/words can differ);
+      a value inside an answer range counts, dates match on the parts the answer gives
+
+    `correct` may be the raw answer string or an AnswerKey from compile_answer().
+    """
+    key = correct if isinstance(correct, AnswerKey) else compile_answer(correct)
+    return _grade(normalize(user or ""), key, user or "")
+
+def _grade(u: str, key: AnswerKey, user: str) -> bool:
+    """is_correct given the user's answer both normalized (u) and raw (for numbers)."""
+    if not u:
+        return False
+
+    # Exact or alias quick pass
+    if u == key.norm or _alias_hit(u, key.norm):
+        return True
+
+    # If both contain numbers, compare typed values (ignore units/extra words):
+    # magnitudes ('100 million' == '100,000,000'), ranges, dates, per-question tolerance
+    if key.numeric:
+        u_values = parse_numeric(user)
+        if u_values and numeric_match(key.numeric, u_values, key.tolerance):
+            return True
+    elif key.digits and _extract_numbers(u) == key.digits:
+        return True
+
+    # Order-insensitive multi-part check
+    c_parts = key.multi_parts
+    if c_parts:
+        u_parts = _tokenize_options(u)
+        if len(u_parts) == len(c_parts):
+            used = [False] * len(c_parts)
+            for a in u_parts:
+                matched = False
+                for j, (b, b_key) in enumerate(c_parts):
+                    if used[j]:
+                        continue
+                    if a == b or _alias_hit(a, b_key) or _similar(a, b, 0.88):
+                        used[j] = True
+                        matched = True
+                        break
+                if not matched:
+                    break
+            else:
+                return True  # all tokens matched in some order
+
+    # Single-part / “any of these options” logic
+    for p, p_key, thresh in key.options:
+        if u == p or _alias_hit(u, p_key):
+            return True
+        if thresh is None:
+            continue
+        if _similar(u, p, thresh):
+            return True
+
+    return False
+
+# ---------------- Verdict cache (shared by all sessions in the process) ----------------
+VERDICT_CACHE_SIZE = 65536
+
+class VerdictCache:
+    """
+    Bounded LRU of verdicts keyed by (question id, normalized user answer).
+    Players converge on a handful of spellings per question, so most submissions
+    become a dict lookup. Entries remember the answer they were graded against,
+    and tolerance, so a bank reload that changes either can't serve a stale verdict;
+    alias or fuzzy-backend changes clear the cache.
+    """
+
+    def __init__(self, maxsize: int = VERDICT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # (qid, u_norm) -> ((answer raw, tolerance), verdict)
+        self._lock = threading.Lock()  # Streamlit sessions run on separate threads
+        self.hits = 0
+        self.misses = 0
+
+    def grade(self, qid: int, user: str, correct) -> bool:
+        """is_correct(user, correct), memoized for question qid."""
+        key = correct if isinstance(correct, AnswerKey) else compile_answer(correct)
+        user = user or ""
+        u = normalize(user)
+        # Numeric answers also depend on what normalize() drops ('8.5' vs '85')
+        slot = (qid, u, parse_numeric(user)) if key.numeric else (qid, u)
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None and entry[0] == (key.raw, key.tolerance):
+                self._entries.move_to_end(slot)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        verdict = _grade(u, key, user)
+        with self._lock:
+            self._entries[slot] = ((key.raw, key.tolerance), verdict)
+            self._entries.move_to_end(slot)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return verdict
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+VERDICT_CACHE = VerdictCache()
+
+reload_aliases()
+
+# ---------------- Batch grading ----------------
+PARALLEL_MIN_ROWS = 20_000  # below this, process start-up costs more than it saves
+_BATCH_CHUNK = 5_000
+
+def _init_grading_worker(variants: dict, canon: dict, similar) -> None:
+    # Workers grade with the parent's live alias index and fuzzy backend
+    global _similar
+    install_alias_tables(variants, canon)
+    _similar = similar
+
+def _grade_rows(rows) -> list:
+    """Verdicts for (raw user, AnswerKey) rows, grading each distinct normalized combo once."""
+    norms, verdicts, out = {}, {}, []
+    for user, key in rows:
+        user = user or ""
+        u = norms.get(user)
+        if u is None:
+            u = norms[user] = normalize(user)
+        answer = (key.raw, key.tolerance)
+        combo = (u, answer, parse_numeric(user)) if key.numeric else (u, answer)
+        verdict = verdicts.get(combo)
+        if verdict is None:
+            verdict = verdicts[combo] = _grade(u, key, user)
+        out.append(verdict)
+    return out
+
+def grade_many(pairs, processes: int = 1) -> list:
+    """
+    Grade many (user, correct) pairs; same verdicts as [is_correct(u, c) for u, c in pairs].
+    `correct` may be a raw string or an AnswerKey. Each distinct answer is compiled
+    once, each distinct user string normalized once, and each distinct
+    (normalized answer, key) combination graded once. With processes > 1 (0 = all
+    CPUs), batches with at least PARALLEL_MIN_ROWS distinct rows are spread over a
+    process pool, normalization included.
+    """
+    keys, row_at, rows, slots = {}, {}, [], []
+    for user, correct in pairs:
+        key = correct if isinstance(correct, AnswerKey) else keys.get(correct)
+        if key is None:
+            key = keys[correct] = compile_answer(correct)
+        row = (user, key.raw, key.tolerance)
+        slot = row_at.get(row)
+        if slot is None:
+            slot = row_at[row] = len(rows)
+            rows.append((user, key))
+        slots.append(slot)
+
+    workers = processes if processes > 0 else (os.cpu_count() or 1)
+    if workers > 1 and len(rows) >= PARALLEL_MIN_ROWS:
+        chunks = [rows[i:i + _BATCH_CHUNK] for i in range(0, len(rows), _BATCH_CHUNK)]
+        with ProcessPoolExecutor(workers, initializer=_init_grading_worker,
+                                 initargs=(_ALIAS_VARIANTS, _ALIAS_CANON, _similar)) as pool:
+            verdicts = [v for chunk in pool.map(_grade_rows, chunks) for v in chunk]
+    else:
+        verdicts = _grade_rows(rows)
+    return [verdicts[slot] for slot in slots]
+
+is_correct_batch = grade_many
@@ -0,0 +1,203 @@
+# leaderboard.py
+"""
+Per-category and overall leaderboards (best game score, accuracy, longest
+streak of correct answers), updated incrementally as each game finishes.
+
+Each board keeps, per metric, a sorted list of ranking keys, one per player.
+A finished game re-ranks only its player on the boards it touches, with bisect:
+O(log n) search plus one memmove. The top TOP_K rows of those boards are then
+copied into a new snapshot, so page views read a ready-made dict without a lock
+or a database query. A player's accuracy can go down, so a fixed-size heap would
+lose players who fall out of the top K and later climb back; the sorted list
+keeps everyone.
+
+With a results store, every game's summary is also added to that player's
+stored totals per board (results_store.record_board), so load() reads one row
+per player and board instead of replaying the answers; the process-wide
+leaderboard is kept current by reloading.py.
+"""
+
+import threading
+from bisect import bisect_left, insort
+from typing import NamedTuple
+from categories import fold
+from game import MIX_LABEL
+from reloading import reloading
+
+OVERALL = "Overall"
+TOP_K = 10
+MIN_ANSWERS = 20  # answers needed before a player's accuracy is ranked
+RELOAD_SECONDS = 60
+
+class Row(NamedTuple):
+    rank: int
+    player: str
+    value: float  # best %, accuracy %, or streak length
+    games: int
+
+class BoardSnapshot(NamedTuple):
+    best: tuple      # Rows by best single-game score (%)
+    accuracy: tuple  # Rows by overall accuracy (%), players with MIN_ANSWERS+ only
+    streak: tuple    # Rows by longest run of correct answers
+
+def game_summary(right: int, total: int, verdicts) -> dict:
+    """
+    What a finished game adds to a player's totals: the score plus its leading,
+    trailing and longest runs of correct answers, enough to carry a streak over.
+    """
+    answers = len(verdicts)
+    lead = next((i for i, ok in enumerate(verdicts) if not ok), answers)
+    tail = run = 0
+    for ok in verdicts:
+        tail = tail + 1 if ok else 0
+        run = max(run, tail)
+    return {"correct": right, "total": total, "pct": (right / total) * 100 if total else 0.0,
+            "answers": answers, "lead": lead, "tail": tail, "run": run,
+            "all_correct": int(tail == answers)}
+
+class _Player:
+    __slots__ = ("games", "right", "answered", "best", "streak", "best_streak")
+
+    def __init__(self):
+        self.games = self.right = self.answered = self.streak = self.best_streak = 0
+        self.best = 0.0
+
+class _Ranking:
+    """Players ordered by a ranking key (smaller key = higher rank)."""
+    __slots__ = ("keys", "by_player")
+
+    def __init__(self):
+        self.keys = []       # sorted (key..., player)
+        self.by_player = {}
+
+    def set(self, player: str, key: tuple) -> None:
+        old = self.by_player.get(player)
+        if old == key:
+            return
+        if old is not None:
+            del self.keys[bisect_left(self.keys, old)]
+        self.by_player[player] = key
+        insort(self.keys, key)
+
+    def top(self, k: int):
+        return self.keys[:k]
+
+    def rank(self, player: str):
+        key = self.by_player.get(player)
+        return None if key is None else bisect_left(self.keys, key) + 1
+
+class _Board:
+    __slots__ = ("players", "best", "accuracy", "streak")
+
+    def __init__(self):
+        self.players = {}
+        self.best, self.accuracy, self.streak = _Ranking(), _Ranking(), _Ranking()
+
+    def record(self, player: str, right: int, total: int, verdicts) -> None:
+        p = self.players.get(player)
+        if p is None:
+            p = self.players[player] = _Player()
+        p.games += 1
+        p.right += right
+        p.answered += total
+        p.best = max(p.best, (right / total) * 100 if total else 0.0)
+        for ok in verdicts:  # a streak carries over from the previous game
+            p.streak = p.streak + 1 if ok else 0
+            p.best_streak = max(p.best_streak, p.streak)
+        self._rank(player, p)
+
+    def restore(self, player: str, games, right, answered, best, streak, best_streak) -> None:
+        """Set a player's totals as stored (a board_players row)."""
+        p = self.players[player] = _Player()
+        p.games, p.right, p.answered, p.best, p.streak, p.best_streak = (
+            games, right, answered, best, streak, best_streak)
+        self._rank(player, p)
+
+    def _rank(self, player: str, p: _Player) -> None:
+        # Ties go to the player with more games behind the number
+        self.best.set(player, (-p.best, -p.games, player))
+        if p.answered >= MIN_ANSWERS:
+            self.accuracy.set(player, (-p.right / p.answered, -p.answered, player))
+        self.streak.set(player, (-p.best_streak, -p.games, player))
+
+    def snapshot(self, k: int) -> BoardSnapshot:
+        players = self.players
+        def rows(ranking, scale=1):
+            return tuple(Row(i, key[-1], -key[0] * scale, players[key[-1]].games)
+                         for i, key in enumerate(ranking.top(k), start=1))
+        return BoardSnapshot(rows(self.best), rows(self.accuracy, 100), rows(self.streak))
+
+class Leaderboard:
+    """Shared by every session; record_game() after each finished game."""
+
+    def __init__(self, top_k: int = TOP_K, results=None):
+        self.top_k = top_k
+        self.results = results  # ResultsStore or None; receives each game's summary
+        self._boards = {}
+        self._snapshot = {}
+        self._lock = threading.Lock()
+
+    def record_game(self, player: str, category: str, right: int, total: int, verdicts) -> None:
+        """Anonymous players ("") are not ranked; mixed-category games count for OVERALL only."""
+        if not player:
+            return
+        cat = fold(category)
+        names = (OVERALL,) if cat == MIX_LABEL else (OVERALL, cat)
+        with self._lock:
+            snap = dict(self._snapshot)  # copy-on-write: readers keep the old dict
+            for name in names:
+                board = self._boards.get(name)
+                if board is None:
+                    board = self._boards[name] = _Board()
+                board.record(player, right, total, verdicts)
+                snap[name] = board.snapshot(self.top_k)
+            self._snapshot = snap
+            if self.results is not None:
+                # Queued under the lock, so load() either waits for this game or sees it stored
+                summary = game_summary(right, total, verdicts)
+                for name in names:
+                    self.results.record_board(name, player, summary)
+
+    def board(self, category: str = OVERALL):
+        """Top rows for a category (or OVERALL); None if nobody has played it."""
+        return self._snapshot.get(category if category == OVERALL else fold(category))
+
+    def boards(self) -> dict:
+        return self._snapshot
+
+    def rank(self, player: str, category: str = OVERALL, metric: str = "best"):
+        """1-based rank of a player (not limited to the top K), or None."""
+        board = self._boards.get(category if category == OVERALL else fold(category))
+        if board is None:
+            return None
+        with self._lock:
+            return getattr(board, metric).rank(player)
+
+    def load(self, results) -> None:
+        """
+        Replace every board with the totals stored in a results_store.ResultsStore.
+        Games this process recorded but the writer has not committed yet are
+        flushed first, so a reload never drops a game just finished.
+        """
+        with self._lock:
+            results.flush()
+            rows = results.query(
+                "SELECT board, player, games, correct, answered, best, streak, best_streak"
+                " FROM board_players")
+            boards = {}
+            for name, player, *totals in rows:
+                board = boards.get(name)
+                if board is None:
+                    board = boards[name] = _Board()
+                board.restore(player, *totals)
+            self._boards = boards
+            self._snapshot = {name: board.snapshot(self.top_k) for name, board in boards.items()}
+
+_LEADERBOARD = reloading(Leaderboard, RELOAD_SECONDS)
+
+def leaderboard(results=None) -> Leaderboard:
+    """Process-wide leaderboard; given a results store, games persist to it and load from it."""
+    board = _LEADERBOARD(results)
+    if results is not None:
+        board.results = results
+    return board
@@ -0,0 +1,233 @@
+# numeric.py
+"""
+Typed numeric answers: integers, decimals, ranges ("350–400", "between 350 and 400"),
+dates ("July 8, 1982", "8 July 1982", "1982-07-08", "7/8/1982", "October 1994") and
+scaled magnitudes ("100 million", "45.6 billion", "1,250", "twenty one").
+
+parse_numeric() tokenizes the raw text in one regex pass and folds the tokens
+left to right into NumValues; numeric_match() compares an answer's values with a
+user's, honoring a per-question tolerance.
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+from textfold import FOLD_TABLE
+
+# ---------------- Number words (also used by grading.normalize) ----------------
+NUM_WORDS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16,
+    "seventeen": 17, "eighteen": 18, "nineteen": 19,
+    "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+    "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90,
+    "hundred": 100, "thousand": 1000, "million": 1_000_000, "billion": 1_000_000_000,
+}
+_NUM_SPLIT_RE = re.compile(r"[\s-]+")
+
+def words_to_int(phrase: str):
+    words = [w for w in _NUM_SPLIT_RE.split(phrase.strip().lower()) if w]
+    if not words or not all(w in NUM_WORDS for w in words):
+        return None
+    total, current = 0, 0
+    for w in words:
+        val = NUM_WORDS[w]
+        if val < 100:
+            current += val
+        elif val == 100:
+            current = (current or 1) * 100
+        else:  # thousand/million/...
+            total += (current or 1) * val
+            current = 0
+    return total + current
+
+# ---------------- Typed values ----------------
+class NumValue(NamedTuple):
+    kind: str   # "num", "range" or "date"
+    lo: object  # number, or (year, month, day) for dates (0 = not given)
+    hi: object
+
+SCALES = {"thousand": 1000, "k": 1000, "million": 1_000_000, "mil": 1_000_000,
+          "billion": 1_000_000_000, "bn": 1_000_000_000, "trillion": 1_000_000_000_000}
+MONTHS = {name: i for i, names in enumerate((
+    ("january", "jan"), ("february", "feb"), ("march", "mar"), ("april", "apr"),
+    ("may",), ("june", "jun"), ("july", "jul"), ("august", "aug"),
+    ("september", "sep", "sept"), ("october", "oct"), ("november", "nov"), ("december", "dec"),
+), start=1) for name in names}
+
+_TOKEN_RE = re.compile(
+    r"(?P<iso>(?<!\d)\d{4}-\d{1,2}-\d{1,2}(?!\d))"
+    r"|(?P<mdy>(?<!\d)\d{1,2}/\d{1,2}/\d{4}(?!\d))"
+    # digits not glued to a preceding letter ('m3gan'); ',' / ' ' groups of three are thousands
+    r"|(?P<num>(?<![\w.])(?:\d{1,3}(?:[, ]\d{3}(?![\d]))+|\d+)(?:\.\d+)?)"
+    r"|(?P<word>[a-z]+)"
+    r"|(?P<dash>-)"
+)
+
+def _tokens(text: str):
+    out = []
+    for m in _TOKEN_RE.finditer(text.lower().translate(FOLD_TABLE)):  # dashes, fullwidth digits
+        kind = m.lastgroup
+        tok = m.group(kind)
+        if kind == "num":
+            digits = tok.replace(",", "").replace(" ", "")
+            out.append(("num", float(digits) if "." in digits else int(digits)))
+        elif kind == "iso":
+            y, mo, d = (int(x) for x in tok.split("-"))
+            out.append(("date", (y, mo, d)))
+        elif kind == "mdy":
+            mo, d, y = (int(x) for x in tok.split("/"))
+            out.append(("date", (y, mo, d)))
+        elif kind == "word":
+            if tok in NUM_WORDS:
+                out.append(("numword", tok))
+            elif tok in MONTHS:
+                out.append(("month", MONTHS[tok]))
+            elif tok in SCALES:
+                out.append(("scale", SCALES[tok]))
+            elif tok in ("to", "and", "between"):
+                out.append((tok, tok))
+            else:
+                out.append(("word", tok))
+        else:
+            out.append(("dash", tok))
+    return out
+
+def _is_day(tok) -> bool:
+    return tok[0] == "num" and isinstance(tok[1], int) and 1 <= tok[1] <= 31
+
+def _is_year(tok) -> bool:
+    return tok[0] == "num" and isinstance(tok[1], int) and 1000 <= tok[1] <= 9999
+
+def _read_value(toks, i):
+    """Parse one number/date starting at toks[i]; returns (NumValue or None, next index)."""
+    kind, val = toks[i]
+    n = len(toks)
+    if kind == "date":
+        return NumValue("date", val, val), i + 1
+    if kind == "month":  # July [8] [,] 1982 | July 1982
+        if i + 2 < n and _is_day(toks[i + 1]) and _is_year(toks[i + 2]):
+            d = (toks[i + 2][1], val, toks[i + 1][1])
+            return NumValue("date", d, d), i + 3
+        if i + 1 < n and _is_year(toks[i + 1]):
+            d = (toks[i + 1][1], val, 0)
+            return NumValue("date", d, d), i + 2
+        return None, i + 1
+    if kind == "num":
+        if _is_day(toks[i]) and i + 2 < n and toks[i + 1][0] == "month" and _is_year(toks[i + 2]):
+            d = (toks[i + 2][1], toks[i + 1][1], val)  # 8 July 1982
+            return NumValue("date", d, d), i + 3
+        if i + 1 < n:  # 100 million, 45.6 billion, 2 hundred
+            nxt_kind, nxt = toks[i + 1]
+            if nxt_kind == "scale":
+                val, i = val * nxt, i + 1
+            elif nxt_kind == "numword" and NUM_WORDS[nxt] >= 100:
+                val, i = val * NUM_WORDS[nxt], i + 1
+        if isinstance(val, float) and val.is_integer():
+            val = int(val)
+        return NumValue("num", val, val), i + 1
+    if kind == "numword":  # twenty one / twenty-one / one hundred million
+        words, j = [val], i + 1
+        while j < n:
+            if toks[j][0] == "numword":
+                words.append(toks[j][1])
+                j += 1
+            elif (toks[j][0] == "dash" and j + 1 < n and toks[j + 1][0] == "numword"
+                  and NUM_WORDS[words[-1]] in range(20, 100, 10) and NUM_WORDS[toks[j + 1][1]] < 10):
+                j += 1  # hyphenated compound, not a range
+            else:
+                break
+        value = words_to_int(" ".join(words))
+        if j < n and toks[j][0] == "scale":
+            value, j = value * toks[j][1], j + 1
+        return NumValue("num", value, value), j
+    return None, i + 1
+
+@lru_cache(maxsize=16384)
+def parse_numeric(text: str) -> tuple:
+    """All numeric values in text, in order (empty tuple if none)."""
+    toks = _tokens(text or "")
+    values, i, n = [], 0, len(toks)
+    between = False
+    while i < n:
+        if toks[i][0] == "between":
+            between, i = True, i + 1
+            continue
+        value, i = _read_value(toks, i)
+        if value is None:
+            between = False
+            continue
+        # Ranges: 350–400, 350 to 400, between 350 and 400. Without "between" the
+        # values must ascend: "9 to 5" is a title, not a range
+        joiner = ("and",) if between else ("dash", "to")
+        if value.kind == "num" and i + 1 < n and toks[i][0] in joiner:
+            hi, j = _read_value(toks, i + 1)
+            if hi is not None and hi.kind == "num" and (between or value.lo < hi.lo):
+                lo, hi = sorted((value.lo, hi.lo))
+                value, i = NumValue("range", lo, hi), j
+        between = False
+        values.append(value)
+    return tuple(values)
+
+_NUMBER_KINDS = frozenset(("num", "numword", "month", "scale", "date"))
+
+def mostly_numeric(text: str) -> bool:
+    """
+    True when numbers make up the text ("350–400", "October 1994", "1,250 feet"):
+    no word before its last number and no more words (units) than numbers.
+    Titles such as "M3GAN 2.0" or "2 Cool 4 Skool" are not.
+    """
+    numbers = words = 0
+    for kind, _tok in _tokens(text or ""):
+        if kind in _NUMBER_KINDS:
+            if words:
+                return False
+            numbers += 1
+        elif kind == "word":
+            words += 1
+    return numbers > 0 and words <= numbers
+
+# ---------------- Tolerance & matching ----------------
+class Tolerance(NamedTuple):
+    absolute: float = 0.0
+    relative: float = 0.0
+
+EXACT = Tolerance()
+
+def parse_tolerance(spec) -> Tolerance:
+    """None -> exact; 5 or '±5' -> absolute; '10%' -> relative."""
+    if spec is None or spec == "":
+        return EXACT
+    if isinstance(spec, (int, float)):
+        return Tolerance(absolute=float(spec))
+    s = str(spec).strip().lstrip("±+")
+    if s.endswith("%"):
+        return Tolerance(relative=float(s[:-1]) / 100)
+    return Tolerance(absolute=float(s))
+
+def _close(a, b, tol: Tolerance) -> bool:
+    slack = max(tol.absolute, tol.relative * abs(a), 1e-9 * max(1.0, abs(a)))
+    return abs(a - b) <= slack
+
+def _value_match(a: NumValue, u: NumValue, tol: Tolerance) -> bool:
+    if a.kind == "date" or u.kind == "date":
+        if a.kind != u.kind:
+            # A bare year against a date: the years must agree ('1994' == 'October 1994'),
+            # and a year alone is not enough for an answer that gives the day
+            date, year = (a, u) if a.kind == "date" else (u, a)
+            if date is a and a.lo[2]:
+                return False
+            return year.kind == "num" and year.lo == date.lo[0]
+        # Every component the answer specifies must agree (user may be more precise)
+        return all(x == y for x, y in zip(a.lo, u.lo) if x)
+    if a.kind == "range":
+        # A user value or range must fall inside the answer's range (edges within tolerance)
+        return ((a.lo <= u.lo or _close(a.lo, u.lo, tol))
+                and (u.hi <= a.hi or _close(a.hi, u.hi, tol)))
+    return u.kind == "num" and _close(a.lo, u.lo, tol)
+
+def numeric_match(answer: tuple, user: tuple, tol: Tolerance = EXACT) -> bool:
+    """Same number of values, pairwise equal (within tol); values/ranges inside an answer range count."""
+    return bool(answer) and len(answer) == len(user) and all(
+        _value_match(a, u, tol) for a, u in zip(answer, user))
@@ -1,6 +1,13 @@
 # question_bank.py
 
-QUESTIONS = [
+import os
+from question_store import QuestionStore
+from bank_file import open_bank
+
+# Optional external bank file (see bank_file.py); the list below is the built-in default.
+BANK_PATH = os.environ.get("TRIVIA_BANK_PATH", "")
+
+_QUESTION_DATA = [
     # --- Geography ---
     {"q": "What is the capital of France?", "a": "Paris", "category": "Geography"},
     {"q": "Mount Everest is on the border of which two countries?", "a": "Nepal and China", "category": "Geography"},
@@ -563,5 +570,12 @@ QUESTIONS = [
 
 ]
 
+# Column store; answer keys are installed from the precomputed cache by bank_cache.warm_start()
+# (compiled on demand otherwise), so grading only has to normalize the user's input.
+# An external bank is memory-mapped instead; its questions are decoded when first drawn.
+QUESTIONS = (open_bank(BANK_PATH) if BANK_PATH
+             else QuestionStore.from_dicts(_QUESTION_DATA, compile_keys=False))
+del _QUESTION_DATA
+
 # Optional: you can compute the category list from the data.
-CATEGORIES = sorted({q["category"] for q in QUESTIONS})
+CATEGORIES = sorted(QUESTIONS.category_names)
@@ -0,0 +1,156 @@
+# question_store.py
+
+import hashlib, json
+from array import array
+from collections.abc import Mapping
+from grading import compile_answer
+
+_FIELDS = ("q", "a", "category", "key")
+
+class Question(Mapping):
+    """
+    Read-only view of one stored question. Behaves like the old question dict
+    (q["a"], q.get("image"), {**q}) without holding any data of its own.
+    """
+    __slots__ = ("_store", "id")
+
+    def __init__(self, store, qid: int):
+        self._store = store
+        self.id = qid
+
+    def __getitem__(self, field):
+        store, qid = self._store, self.id
+        if field == "q":
+            return store.text(qid)
+        if field == "a":
+            return store.answer(qid)
+        if field == "category":
+            return store.category(qid)
+        if field == "key":
+            return store.answer_key(qid)
+        extra = store.extra(qid)
+        if extra is not None and field in extra:
+            return extra[field]
+        raise KeyError(field)
+
+    def __iter__(self):
+        yield from _FIELDS
+        yield from self._store.extra(self.id) or ()
+
+    def __len__(self):
+        return len(_FIELDS) + len(self._store.extra(self.id) or ())
+
+    def __repr__(self):
+        return f"Question({self.id}, {dict(self)!r})"
+
+class BaseQuestionStore:
+    """
+    Sequence behaviour shared by question stores: ids are 0..len-1, and
+    indexing/iteration hands out Question views. Subclasses provide __len__ and
+    text/answer/category/answer_key/extra, plus category_names/category_codes.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, qid):
+        if isinstance(qid, slice):
+            return [Question(self, i) for i in range(*qid.indices(len(self)))]
+        if qid < 0:
+            qid += len(self)
+        if not 0 <= qid < len(self):
+            raise IndexError("question id out of range")
+        return Question(self, qid)
+
+    def __iter__(self):
+        for qid in range(len(self)):
+            yield Question(self, qid)
+
+class QuestionStore(BaseQuestionStore):
+    """
+    Column-oriented question bank. Question text and answers are parallel lists,
+    categories are interned into a small table and stored as array('H') codes,
+    and rarely used fields (e.g. "image") live in a sparse per-id dict.
+    Indexing/iteration yields Question views, so code written against the
+    list-of-dicts QUESTIONS keeps working.
+    """
+    __slots__ = ("texts", "answers", "category_codes", "category_names",
+                 "_category_code", "extras", "_keys", "compile_keys")
+
+    def __init__(self, compile_keys: bool = True):
+        self.texts = []
+        self.answers = []
+        self.category_codes = array("H")
+        self.category_names = []
+        self._category_code = {}
+        self.extras = {}
+        self._keys = []
+        self.compile_keys = compile_keys
+
+    @classmethod
+    def from_dicts(cls, questions, compile_keys: bool = True) -> "QuestionStore":
+        store = cls(compile_keys=compile_keys)
+        for q in questions:
+            store.append(q["q"], q["a"], q["category"],
+                         **{k: v for k, v in q.items() if k not in _FIELDS})
+        return store
+
+    def _code_for(self, category: str) -> int:
+        code = self._category_code.get(category)
+        if code is None:
+            code = len(self.category_names)
+            if code > 0xFFFF:
+                raise ValueError("too many distinct categories for array('H') codes")
+            self.category_names.append(category)
+            self._category_code[category] = code
+        return code
+
+    def append(self, q: str, a: str, category: str, **extra) -> int:
+        """Add a question and return its id."""
+        qid = len(self.texts)
+        self.texts.append(q)
+        self.answers.append(a)
+        self.category_codes.append(self._code_for(category))
+        self._keys.append(compile_answer(a, extra.get("tolerance")) if self.compile_keys else None)
+        if extra:
+            self.extras[qid] = extra
+        return qid
+
+    def answer_key(self, qid: int):
+        """Precompiled AnswerKey; compiled on demand when the store was built without keys."""
+        key = self._keys[qid]
+        if key is None:
+            key = compile_answer(self.answers[qid], (self.extras.get(qid) or {}).get("tolerance"))
+        return key
+
+    def set_answer_keys(self, keys) -> None:
+        """Adopt precompiled keys (one per question, e.g. from bank_cache)."""
+        keys = list(keys)
+        if len(keys) != len(self.texts):
+            raise ValueError("answer key count does not match the store")
+        self._keys = keys
+
+    def content_digest(self) -> str:
+        """Hash of everything derived data depends on (answers, categories, extras such as tolerance)."""
+        h = hashlib.sha256()
+        for a in self.answers:
+            h.update(a.encode("utf-8"))
+            h.update(b"\0")
+        h.update("\0".join(self.category_names).encode("utf-8"))
+        h.update(self.category_codes.tobytes())
+        h.update(json.dumps(sorted(self.extras.items()), sort_keys=True, default=str).encode("utf-8"))
+        return h.hexdigest()
+
+    def text(self, qid: int) -> str:
+        return self.texts[qid]
+
+    def answer(self, qid: int) -> str:
+        return self.answers[qid]
+
+    def category(self, qid: int) -> str:
+        return self.category_names[self.category_codes[qid]]
+
+    def extra(self, qid: int):
+        """Optional fields (e.g. {"image": ...}) or None."""
+        return self.extras.get(qid)
+
+    def __len__(self):
+        return len(self.texts)
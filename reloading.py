@@ -0,0 +1,46 @@
+# reloading.py
+"""
+Process-wide objects backed by aggregates in the results store (the sampler's
+miss rates, the leaderboards, question analytics).
+
+Each worker process feeds its own copy live, but only sees other workers'
+games through the store, so the copy is replaced with the stored aggregates
+(its load(results)) on first use and again once it is `seconds` old; all
+workers then converge on the same numbers. The check and the load run under a
+lock, so concurrent sessions never load twice or see a half-loaded object.
+
+    _SAMPLER = reloading(AdaptiveSampler, 300)
+    _SAMPLER(results)     # the shared sampler, reloaded if due
+    _SAMPLER.invalidate() # rebuilt by the next call
+"""
+
+import threading, time
+
+class Reloading:
+    __slots__ = ("factory", "seconds", "_value", "_loaded_at", "_lock")
+
+    def __init__(self, factory, seconds: float):
+        self.factory = factory    # () -> object with load(results)
+        self.seconds = seconds
+        self._value = None
+        self._loaded_at = None    # monotonic time of the last load()
+        self._lock = threading.Lock()
+
+    def __call__(self, results=None):
+        """The shared object; given a results store, (re)loaded from it when due."""
+        with self._lock:
+            if self._value is None:
+                self._value = self.factory()
+            now = time.monotonic()
+            if results is not None and (self._loaded_at is None or now - self._loaded_at >= self.seconds):
+                self._loaded_at = now
+                self._value.load(results)
+            return self._value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._value = None
+            self._loaded_at = None
+
+def reloading(factory, seconds: float) -> Reloading:
+    return Reloading(factory, seconds)
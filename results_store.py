@@ -0,0 +1,270 @@
+# results_store.py
+"""
+Persistent game results in SQLite (WAL mode): every graded answer, every skip,
+each finished game's score, and each player's seen-questions bitset.
+
+Aggregates that readers load at startup are kept up to date on the write path,
+by upserts derived from the same rows (_DERIVED), so nothing has to scan the
+answers table: per-question and per-player decayed miss rates (sampler.py),
+per-question counters and wrong-answer sketches (analytics.py).
+Leaderboard totals (leaderboard.py) are likewise upserted per board and player
+from each finished game's summary (record_board), never recomputed from answers.
+
+Writes never touch disk on the caller's thread. record_*() put a row on a
+bounded queue; one background writer thread drains it and inserts in batches,
+one transaction per batch. If the queue is full (disk stalled), the row is
+dropped and counted in `dropped` rather than blocking a click.
+
+Shutdown: close() (registered with atexit for the process-wide store) stops
+accepting rows (later ones count as dropped), writes everything still queued
+and waits up to `timeout` seconds for the writer. flush() waits for the queued
+rows without closing; on a closed store it returns False at once.
+Rows still queued when the process is killed (SIGKILL, OOM) are lost.
+
+    TRIVIA_RESULTS_DB=/data/results.db   # default: results.db next to this file; "" disables
+"""
+
+import atexit, os, queue, sqlite3, threading, time
+from analytics import SKETCH_DECAY, SKETCH_SIZE
+from grading import normalize
+from sampler import DECAY as WEIGHT_DECAY
+
+RESULTS_DB_PATH = os.environ.get(
+    "TRIVIA_RESULTS_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.db")
+)
+QUEUE_SIZE = 10_000
+BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    game_id TEXT NOT NULL, player TEXT NOT NULL, qid INTEGER NOT NULL,
+    answer TEXT NOT NULL, correct INTEGER NOT NULL, seconds REAL, at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS skips (
+    game_id TEXT NOT NULL, player TEXT NOT NULL, qid INTEGER NOT NULL, at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS games (
+    game_id TEXT PRIMARY KEY, player TEXT NOT NULL, category TEXT NOT NULL,
+    started_at REAL NOT NULL, finished_at REAL NOT NULL,
+    correct INTEGER NOT NULL, total INTEGER NOT NULL, pct REAL NOT NULL, passed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    player TEXT PRIMARY KEY, seen BLOB NOT NULL, updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS question_weights (
+    qid INTEGER PRIMARY KEY, misses REAL NOT NULL, attempts REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS player_weights (
+    player TEXT NOT NULL, qid INTEGER NOT NULL, misses REAL NOT NULL, attempts REAL NOT NULL,
+    PRIMARY KEY (player, qid)
+);
+CREATE TABLE IF NOT EXISTS question_stats (
+    qid INTEGER PRIMARY KEY, attempts INTEGER NOT NULL, correct INTEGER NOT NULL,
+    skips INTEGER NOT NULL, seconds REAL NOT NULL, seconds_sq REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS question_wrong (
+    qid INTEGER NOT NULL, answer TEXT NOT NULL, count REAL NOT NULL,
+    PRIMARY KEY (qid, answer)
+);
+CREATE TABLE IF NOT EXISTS board_players (
+    board TEXT NOT NULL, player TEXT NOT NULL, games INTEGER NOT NULL,
+    correct INTEGER NOT NULL, answered INTEGER NOT NULL, best REAL NOT NULL,
+    streak INTEGER NOT NULL, best_streak INTEGER NOT NULL,
+    PRIMARY KEY (board, player)
+);
+CREATE INDEX IF NOT EXISTS answers_qid ON answers (qid);
+CREATE INDEX IF NOT EXISTS games_player ON games (player);
+"""
+
+_INSERT = {
+    "answer": "INSERT INTO answers VALUES (?, ?, ?, ?, ?, ?, ?)",
+    "skip": "INSERT INTO skips VALUES (?, ?, ?, ?)",
+    "game": "INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "seen": "INSERT OR REPLACE INTO players VALUES (?, ?, ?)",
+    # One finished game added to a player's totals; SET reads the pre-update row,
+    # so a streak carries over unless the game has a miss
+    "board": "INSERT INTO board_players VALUES"
+             " (:board, :player, 1, :correct, :total, :pct, :tail, :run)"
+             " ON CONFLICT (board, player) DO UPDATE SET games = games + 1,"
+             " correct = correct + :correct, answered = answered + :total, best = max(best, :pct),"
+             " streak = CASE WHEN :all_correct THEN streak + :answers ELSE :tail END,"
+             " best_streak = max(best_streak, streak + :lead, :run)",
+}
+
+def _answer_params(row) -> dict:
+    _game_id, player, qid, answer, correct, seconds, _at = row
+    return {"player": player, "qid": qid, "correct": correct, "miss": 1 - correct,
+            "seconds": seconds or 0.0, "key": normalize(answer or ""),
+            "decay": WEIGHT_DECAY, "sketch_decay": SKETCH_DECAY, "size": SKETCH_SIZE}
+
+# kind -> (row -> parameters, [statements]); the statements run in order for each
+# row, in the same transaction as the rows themselves
+_DERIVED = {
+    "answer": (_answer_params, [
+        # Miss rates decayed per attempt, as sampler.AdaptiveSampler.record does
+        "INSERT INTO question_weights VALUES (:qid, :miss, 1) ON CONFLICT (qid) DO UPDATE SET"
+        " misses = misses * :decay + :miss, attempts = attempts * :decay + 1",
+        "INSERT INTO player_weights SELECT :player, :qid, :miss, 1 WHERE :player != ''"
+        " ON CONFLICT (player, qid) DO UPDATE SET"
+        " misses = misses * :decay + :miss, attempts = attempts * :decay + 1",
+        # analytics.QuestionAnalytics counters
+        "INSERT INTO question_stats VALUES (:qid, 1, :correct, 0, :seconds, :seconds * :seconds)"
+        " ON CONFLICT (qid) DO UPDATE SET attempts = attempts + 1, correct = correct + :correct,"
+        " seconds = seconds + :seconds, seconds_sq = seconds_sq + :seconds * :seconds",
+        # analytics.QuestionAnalytics Space-Saving sketch of wrong answers: decay on
+        # every attempt; a miss bumps its answer, or adds it (taking over the
+        # smallest counter's count once the sketch is full)
+        "UPDATE question_wrong SET count = count * :sketch_decay WHERE qid = :qid",
+        "UPDATE question_wrong SET count = count + 1 WHERE :miss AND qid = :qid AND answer = :key",
+        "INSERT INTO question_wrong SELECT :qid, :key, 1 + CASE WHEN n < :size THEN 0 ELSE low END"
+        " FROM (SELECT count(*) AS n, min(count) AS low FROM question_wrong WHERE qid = :qid)"
+        " WHERE :miss AND NOT EXISTS (SELECT 1 FROM question_wrong WHERE qid = :qid AND answer = :key)",
+        "DELETE FROM question_wrong WHERE rowid = (SELECT rowid FROM question_wrong"
+        " WHERE qid = :qid AND answer != :key ORDER BY count, rowid LIMIT 1)"
+        " AND (SELECT count(*) FROM question_wrong WHERE qid = :qid) > :size",
+    ]),
+    "skip": (lambda row: {"qid": row[2]}, [
+        "INSERT INTO question_stats VALUES (:qid, 0, 0, 1, 0, 0)"
+        " ON CONFLICT (qid) DO UPDATE SET skips = skips + 1",
+    ]),
+}
+
+def connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints; fine for game stats
+    return conn
+
+class ResultsStore:
+    def __init__(self, path: str = RESULTS_DB_PATH, queue_size: int = QUEUE_SIZE,
+                 batch_size: int = BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        with connect(path) as conn:
+            conn.executescript(_SCHEMA)
+        conn.close()
+        self._writer = threading.Thread(target=self._run, name="results-writer", daemon=True)
+        self._writer.start()
+
+    # ---- writes (non-blocking) ----
+    def _put(self, kind: str, row: tuple) -> None:
+        if self._closed:
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait((kind, row))
+        except queue.Full:
+            self.dropped += 1
+
+    def record_answer(self, game_id, player, qid, answer, correct, seconds=None) -> None:
+        self._put("answer", (game_id, player, qid, answer, int(correct), seconds, time.time()))
+
+    def record_skip(self, game_id, player, qid) -> None:
+        self._put("skip", (game_id, player, qid, time.time()))
+
+    def record_game(self, game_id, player, category, started_at, score) -> None:
+        self._put("game", (game_id, player, category, started_at, time.time(),
+                           score.right, score.total, score.pct, int(score.passed)))
+
+    def save_seen(self, player, seen: bytes) -> None:
+        self._put("seen", (player, seen, time.time()))
+
+    def record_board(self, board, player, game: dict) -> None:
+        """Add one game to a player's leaderboard totals (see leaderboard.game_summary)."""
+        self._put("board", {"board": board, "player": player, **game})
+
+    # ---- reads (own connection; WAL readers don't wait on the writer) ----
+    def load_seen(self, player) -> bytes:
+        conn = connect(self.path)
+        try:
+            row = conn.execute("SELECT seen FROM players WHERE player = ?", (player,)).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else b""
+
+    def query(self, sql: str, params=()) -> list:
+        conn = connect(self.path)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    # ---- writer thread ----
+    def _run(self) -> None:
+        conn = connect(self.path)
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not self._write(conn, batch):
+                    return
+        finally:
+            conn.close()
+
+    def _write(self, conn, batch) -> bool:
+        """Insert one batch in a single transaction; False once the stop marker is seen."""
+        rows, waiters, running = {}, [], True
+        for kind, row in batch:
+            if kind == "flush":
+                waiters.append(row)
+            elif kind == "stop":
+                waiters.append(row)
+                running = False
+            else:
+                rows.setdefault(kind, []).append(row)
+        if rows:
+            try:
+                with conn:
+                    for kind, kind_rows in rows.items():
+                        conn.executemany(_INSERT[kind], kind_rows)
+                        if kind in _DERIVED:
+                            params, statements = _DERIVED[kind]
+                            for row in kind_rows:
+                                values = params(row)
+                                for sql in statements:
+                                    conn.execute(sql, values)
+            except sqlite3.Error:
+                self.dropped += sum(map(len, rows.values()))
+        for done in waiters:
+            done.set()
+        return running
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything queued so far is written; False on timeout or once closed."""
+        if self._closed:
+            return False
+        done = threading.Event()
+        try:
+            self._queue.put(("flush", done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write what is queued, then stop the writer. Safe to call twice."""
+        if self._closed:
+            return
+        self._closed = True
+        done = threading.Event()
+        try:
+            self._queue.put(("stop", done), timeout=timeout)
+        except queue.Full:
+            return
+        self._writer.join(timeout)
+
+_STORE = None
+
+def results_store():
+    """Process-wide store (None when TRIVIA_RESULTS_DB is empty); opened on first use."""
+    global _STORE
+    if _STORE is None and RESULTS_DB_PATH:
+        _STORE = ResultsStore()
+        atexit.register(_STORE.close)
+    return _STORE
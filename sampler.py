@@ -0,0 +1,264 @@
+# sampler.py
+"""
+Weighted question sampling. FenwickSampler keeps item weights in a Fenwick
+(binary indexed) tree: setting a weight and drawing an item are O(log n), and k
+draws without replacement are O(k log n), so a 100k-question bank can be
+re-weighted after every graded answer.
+
+AdaptiveSampler draws in one of three modes:
+    UNIFORM   every question equally likely (the default)
+    HARDEST   weighted by each question's recent miss rate across all players
+    MISSED    weighted by one player's own recent miss rate ("show me what I missed")
+Per question, misses and attempts are decayed on every new attempt so recent
+answers count more than old ones, and a prior keeps unplayed questions at an
+even weight. The rates live in the results store (results_store.py keeps them
+current on its write path), so they survive restarts; load() seeds a sampler
+from them, and the process-wide one is kept current by reloading.py.
+"""
+
+import random, threading
+from array import array
+import bitset
+from categories import category_index
+from reloading import reloading
+
+class FenwickSampler:
+    """Weighted draws over positions 0..n-1."""
+    __slots__ = ("weights", "tree", "_top", "_updates")
+
+    def __init__(self, weights):
+        self.weights = array("d", weights)
+        self._top = 1 << max(len(self.weights).bit_length() - 1, 0)
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """O(n) rebuild; also clears floating-point drift from many updates."""
+        n = len(self.weights)
+        tree = array("d", [0.0])
+        tree.extend(self.weights)
+        for i in range(1, n + 1):
+            j = i + (i & -i)
+            if j <= n:
+                tree[j] += tree[i]
+        self.tree = tree
+        self._updates = 0
+
+    def __len__(self):
+        return len(self.weights)
+
+    def total(self) -> float:
+        tree, i, s = self.tree, len(self.weights), 0.0
+        while i:
+            s += tree[i]
+            i &= i - 1
+        return s
+
+    def update(self, pos: int, weight: float) -> None:
+        """Set the weight of one position."""
+        if weight < 0:
+            raise ValueError("weights must be >= 0")
+        delta = weight - self.weights[pos]
+        self.weights[pos] = weight
+        tree, n, i = self.tree, len(self.weights), pos + 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+        self._updates += 1
+        if self._updates > max(n, 1024):
+            self.rebuild()
+
+    def find(self, u: float) -> int:
+        """Position whose cumulative weight range contains u (0 <= u < total)."""
+        tree, n = self.tree, len(self.weights)
+        pos, step = 0, self._top
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] <= u:
+                pos = nxt
+                u -= tree[nxt]
+            step >>= 1
+        return min(pos, n - 1)
+
+    def draw(self, rng=random) -> int:
+        total = self.total()
+        if total <= 0:
+            raise ValueError("no items with positive weight")
+        pos = self.find(rng.random() * total)
+        if self.weights[pos] <= 0:  # rounding landed on an empty slot
+            self.rebuild()
+            pos = self.find(rng.random() * self.total())
+        return pos
+
+    def sample(self, k: int, rng=random, replace: bool = False, accept=None) -> list:
+        """
+        k positions drawn by weight, with or without replacement. Without
+        replacement, accept(pos) can reject positions (each is tried once).
+        """
+        if replace:
+            return [self.draw(rng) for _ in range(k)]
+        out, zeroed = [], []
+        try:
+            while len(out) < k:
+                pos = self.draw(rng)
+                zeroed.append((pos, self.weights[pos]))
+                self.update(pos, 0.0)
+                if accept is None or accept(pos):
+                    out.append(pos)
+        finally:
+            for pos, w in reversed(zeroed):
+                self.update(pos, w)
+        return out
+
+# ---------------- Adaptive (miss-rate) weights ----------------
+DECAY = 0.9        # per attempt: the last ~10 answers to a question dominate its rate
+PRIOR_MISSES = 1.0
+PRIOR_ATTEMPTS = 2.0  # unplayed questions sit at a 50% miss rate
+RELOAD_SECONDS = 300  # the process-wide sampler re-reads the stored rates this often
+
+UNIFORM, HARDEST, MISSED = "uniform", "hardest", "missed"
+MODES = (UNIFORM, HARDEST, MISSED)
+
+def miss_weight(misses: float, attempts: float) -> float:
+    return (misses + PRIOR_MISSES) / (attempts + PRIOR_ATTEMPTS)
+
+def player_weights(results, player: str) -> dict:
+    """qid -> the player's own miss-rate weight, for the questions they have answered."""
+    if results is None or not player:
+        return {}
+    rows = results.query("SELECT qid, misses, attempts FROM player_weights WHERE player = ?", (player,))
+    return {qid: miss_weight(m, a) for qid, m, a in rows}
+
+class AdaptiveSampler:
+    """
+    One Fenwick tree over the whole bank and one per folded category, so a
+    category draw never touches the rest of the bank. record() after each graded
+    answer re-weights that question in both trees; load() replaces every rate
+    with the stored ones. Shared by every session.
+    """
+
+    def __init__(self, index=None):
+        index = index or category_index()
+        n = len(index.all_ids)
+        self.misses = array("d", bytes(8 * n))
+        self.attempts = array("d", bytes(8 * n))
+        w = PRIOR_MISSES / PRIOR_ATTEMPTS
+        self._all = FenwickSampler([w] * n)
+        self._cats = {}                     # folded category -> (tree, qids)
+        self._masks = {None: (1 << n) - 1}  # folded category -> bitset of its qids
+        self._local = array("I", bytes(4 * n))  # qid -> position in its category tree
+        self._home = [None] * n             # qid -> its category tree
+        for cat, qids in index.ids.items():
+            tree = FenwickSampler([w] * len(qids))
+            self._cats[cat] = (tree, qids)
+            self._masks[cat] = bitset.from_ids(qids)
+            for pos, qid in enumerate(qids):
+                self._local[qid] = pos
+                self._home[qid] = tree
+        self._lock = threading.Lock()
+
+    def weight(self, qid: int) -> float:
+        return miss_weight(self.misses[qid], self.attempts[qid])
+
+    def load(self, results) -> None:
+        """Replace the in-memory rates with the results store's question_weights."""
+        n = len(self.misses)
+        misses, attempts = array("d", bytes(8 * n)), array("d", bytes(8 * n))
+        for qid, m, a in results.query("SELECT qid, misses, attempts FROM question_weights"):
+            if 0 <= qid < n:
+                misses[qid], attempts[qid] = m, a
+        with self._lock:
+            self.misses, self.attempts = misses, attempts
+            self._all.weights = array("d", map(miss_weight, misses, attempts))
+            self._all.rebuild()
+            for tree, qids in self._cats.values():
+                tree.weights = array("d", (self._all.weights[q] for q in qids))
+                tree.rebuild()
+
+    def record(self, qid: int, correct: bool) -> None:
+        with self._lock:
+            self.misses[qid] = self.misses[qid] * DECAY + (not correct)
+            self.attempts[qid] = self.attempts[qid] * DECAY + 1
+            w = self.weight(qid)
+            self._all.update(qid, w)
+            self._home[qid].update(self._local[qid], w)
+
+    def mask(self, category) -> int:
+        """Bitset of the question ids in a folded category (None = whole bank)."""
+        return self._masks.get(category, 0)
+
+    def sample(self, category, k: int, rng=random, replace: bool = False, exclude: int = 0,
+               mode: str = UNIFORM, weights=None) -> list:
+        """
+        k question ids from a folded category (None = whole bank). Without
+        replacement, ids in the exclude bitset are never drawn. For MISSED,
+        weights maps qid -> the player's weight (player_weights()); questions
+        they have not answered get the prior.
+        """
+        if mode == UNIFORM:
+            return self._sample_uniform(category, k, rng, replace, exclude)
+        if mode == MISSED:
+            return self._sample_player(category, k, rng, replace, exclude, weights or {})
+        if mode != HARDEST:
+            raise ValueError(f"unknown sampling mode {mode!r}")
+        if category is None:
+            tree, qids = self._all, None
+        else:
+            tree, qids = self._cats.get(category, (None, ()))
+            if tree is None:
+                return []
+        if replace or not exclude:
+            if not replace and k > len(tree):
+                raise ValueError(f"cannot draw {k} of {len(tree)} questions without replacement")
+            with self._lock:
+                picked = tree.sample(k, rng, replace)
+            return picked if qids is None else [qids[pos] for pos in picked]
+
+        allowed = self.mask(category) & ~exclude
+        count = allowed.bit_count()
+        if k > count:
+            raise ValueError(f"cannot draw {k} of {count} allowed questions")
+        if count * 4 < len(tree):
+            # Mostly excluded: draw from a small tree over just the allowed ids
+            ids = bitset.ids(allowed)
+            with self._lock:
+                weights = [self.weight(q) for q in ids]
+            return [ids[pos] for pos in FenwickSampler(weights).sample(k, rng)]
+        # Mostly allowed: draw from the category tree and skip excluded ids
+        if qids is None:
+            accept = lambda pos: not exclude >> pos & 1
+        else:
+            accept = lambda pos: not exclude >> qids[pos] & 1
+        with self._lock:
+            picked = tree.sample(k, rng, accept=accept)
+        return picked if qids is None else [qids[pos] for pos in picked]
+
+    def _allowed(self, category, k: int, replace: bool, exclude: int) -> list:
+        allowed = self.mask(category) & ~exclude
+        ids = bitset.ids(allowed)
+        if not replace and k > len(ids):
+            raise ValueError(f"cannot draw {k} of {len(ids)} allowed questions")
+        return ids
+
+    def _sample_uniform(self, category, k, rng, replace, exclude) -> list:
+        ids = self._allowed(category, k, replace, 0 if replace else exclude)
+        if not ids:
+            return []
+        return rng.choices(ids, k=k) if replace else rng.sample(ids, k)
+
+    def _sample_player(self, category, k, rng, replace, exclude, weights) -> list:
+        ids = self._allowed(category, k, replace, 0 if replace else exclude)
+        if not ids:
+            return []
+        prior = PRIOR_MISSES / PRIOR_ATTEMPTS
+        tree = FenwickSampler([weights.get(q, prior) for q in ids])
+        return [ids[pos] for pos in tree.sample(k, rng, replace)]
+
+_SAMPLER = reloading(AdaptiveSampler, RELOAD_SECONDS)
+
+def question_sampler(results=None) -> AdaptiveSampler:
+    """Process-wide sampler over the category index; seeded from results when given."""
+    return _SAMPLER(results)
+
+def invalidate_question_sampler() -> None:
+    """Call after the bank or category index changes (drops learned weights)."""
+    _SAMPLER.invalidate()
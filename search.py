@@ -0,0 +1,138 @@
+# search.py
+"""
+Keyword search over the bank: an in-process inverted index from normalized
+question and answer tokens (grading.normalize, the same rules as grading) to
+question ids, ranked with BM25. Answer tokens count ANSWER_BOOST times.
+
+    index = search_index()
+    index.search("world cup", category="Pop Culture", limit=20)   # -> [qid, ...]
+    index.add(QUESTIONS.append(q, a, category))                   # incremental
+    game.start_with(index.search("olympics")[:10])               # a themed game
+
+Each posting list is a pair of arrays (question ids ascending, term
+frequencies). A query walks the lists of its rarer terms; terms in more than
+SCAN_LIMIT questions only re-score those candidates (binary search in the
+list), so a query stays fast even when it contains a very common word. When
+every term is that common, the candidates are the terms' champion lists (the
+CHAMPIONS best questions for each term alone, within the searched category,
+rebuilt lazily after adds), so such queries are approximate. The category
+filter applies while candidates are collected, never to an already-truncated
+list.
+"""
+
+import heapq, math, threading
+from array import array
+from bisect import bisect_left
+from grading import normalize
+from categories import fold
+from question_bank import QUESTIONS
+
+ANSWER_BOOST = 2
+SCAN_LIMIT = 500
+CHAMPIONS = 100
+K1, B = 1.2, 0.75  # BM25
+
+def tokens(text: str) -> list:
+    return normalize(text or "").split()
+
+class SearchIndex:
+    def __init__(self, questions=QUESTIONS):
+        self.questions = questions
+        self.postings = {}          # token -> (array of qids, array of term frequencies)
+        self.lengths = array("H")   # tokens per question (answer tokens boosted)
+        self._total_length = 0
+        self._folded = []           # category code -> folded category
+        self._champions = {}        # common token -> {folded category or None: its best qids}
+        self._lock = threading.Lock()
+        for qid in range(len(questions)):
+            self.add(qid)
+
+    def add(self, qid: int) -> None:
+        """Index a question; ids must be added in increasing order (as appended)."""
+        counts = {}
+        for t in tokens(self.questions.text(qid)):
+            counts[t] = counts.get(t, 0) + 1
+        for t in tokens(self.questions.answer(qid)):
+            counts[t] = counts.get(t, 0) + ANSWER_BOOST
+        with self._lock:
+            for t, n in counts.items():
+                plist = self.postings.get(t)
+                if plist is None:
+                    plist = self.postings[t] = (array("I"), array("H"))
+                plist[0].append(qid)
+                plist[1].append(min(n, 0xFFFF))
+                self._champions.pop(t, None)
+            length = min(sum(counts.values()), 0xFFFF)
+            self.lengths.append(length)
+            self._total_length += length
+
+    def _category_of(self, qid: int) -> str:
+        names = self.questions.category_names
+        while len(self._folded) < len(names):  # categories added since the last lookup
+            self._folded.append(fold(names[len(self._folded)]))
+        return self._folded[self.questions.category_codes[qid]]
+
+    def _champions_for(self, t: str, avg: float, cat=None) -> list:
+        by_cat = self._champions.setdefault(t, {})
+        champions = by_cat.get(cat)
+        if champions is None:
+            qids, tfs = self.postings[t]
+            lengths = self.lengths
+            positions = range(len(qids))
+            if cat is not None:
+                positions = [i for i in positions if self._category_of(qids[i]) == cat]
+            best = heapq.nlargest(CHAMPIONS, positions, key=lambda i: (
+                tfs[i] / (tfs[i] + K1 * (1 - B + B * lengths[qids[i]] / avg))))
+            champions = by_cat[cat] = [qids[i] for i in best]
+        return champions
+
+    def search(self, query: str, category: str = None, limit: int = 20) -> list:
+        """Question ids best matching the query, best first; category is a folded name or None."""
+        terms = [t for t in dict.fromkeys(tokens(query)) if t in self.postings]
+        if not terms:
+            return []
+        n = len(self.lengths)
+        avg = self._total_length / n
+        lengths = self.lengths
+        terms.sort(key=lambda t: len(self.postings[t][0]))
+        cat = None if category is None else fold(category)
+        in_category = None if cat is None else (lambda qid: self._category_of(qid) == cat)
+        scores = {}
+        seeded = len(self.postings[terms[0]][0]) > SCAN_LIMIT
+        if seeded:
+            # Only common terms: start from their champion lists (in the category)
+            for t in terms:
+                scores.update(dict.fromkeys(self._champions_for(t, avg, cat), 0.0))
+        for t in terms:
+            qids, tfs = self.postings[t]
+            df = len(qids)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            if seeded and df > SCAN_LIMIT:
+                # Common term: only re-score what the rarer terms found
+                for qid in scores:
+                    i = bisect_left(qids, qid)
+                    if i < df and qids[i] == qid:
+                        tf = tfs[i]
+                        scores[qid] += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * lengths[qid] / avg))
+                continue
+            for qid, tf in zip(qids, tfs):
+                if in_category is not None and not in_category(qid):
+                    continue
+                s = idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * lengths[qid] / avg))
+                scores[qid] = scores.get(qid, 0.0) + s
+            seeded = True
+        return [qid for qid, _s in heapq.nsmallest(limit, scores.items(), key=lambda kv: (-kv[1], kv[0]))]
+
+_INDEX = None
+
+def search_index() -> SearchIndex:
+    """Process-wide index over QUESTIONS; built on first use."""
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = SearchIndex()
+    return _INDEX
+
+def invalidate_search_index() -> None:
+    """Call after QUESTIONS is replaced; the next lookup rebuilds."""
+    global _INDEX
+    _INDEX = None
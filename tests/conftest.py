@@ -0,0 +1,58 @@
+# tests/conftest.py
+import json, os, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pytest
+from bank_file import open_bank, write_bank
+from grading import ALIASES, reload_aliases
+from question_store import QuestionStore
+from results_store import ResultsStore
+
+@pytest.fixture(scope="session")
+def grading_corpus():
+    """(user answer, correct answer, verdict of the original app_categories.is_correct) rows."""
+    with open(os.path.join(ROOT, "tests", "data", "grading_corpus.json"), encoding="utf-8") as f:
+        return [tuple(row) for row in json.load(f)]
+
+# A small bank shared by the store, file and index tests
+SAMPLE_ROWS = [
+    {"q": "How many legs does a spider have?", "a": "Eight", "category": "Nature"},
+    {"q": "Pizza slices eaten per second in the US?", "a": "350–400", "category": "Food"},
+    {"q": "Longest river in the US?", "a": "Mississippi", "category": "Geography"},
+    {"q": "Flag colours?", "a": "Green or red", "category": "Geography"},
+    {"q": "Capital of the UK?", "a": "London", "category": "Geography"},
+]
+
+@pytest.fixture
+def sample_rows():
+    return [dict(row) for row in SAMPLE_ROWS]
+
+@pytest.fixture
+def make_store():
+    """rows -> QuestionStore (answer keys compiled on demand)."""
+    return lambda rows: QuestionStore.from_dicts(rows, compile_keys=False)
+
+@pytest.fixture
+def make_bank(tmp_path):
+    """(rows, file name) -> MappedQuestionStore over a .tqb written to tmp_path."""
+    def written(rows, name="bank.tqb"):
+        path = str(tmp_path / name)
+        write_bank(rows, path)
+        return open_bank(path)
+    return written
+
+@pytest.fixture
+def results(tmp_path):
+    """A ResultsStore on a fresh database, closed after the test."""
+    store = ResultsStore(str(tmp_path / "results.db"))
+    yield store
+    store.close()
+
+@pytest.fixture
+def aliases():
+    """Restores ALIASES (and everything derived from it) after the test."""
+    saved = {k: set(v) for k, v in ALIASES.items()}
+    yield ALIASES
+    reload_aliases(saved)
@@ -0,0 +1,31 @@
+# tests/test_analytics.py
+import random
+import pytest
+from analytics import QuestionAnalytics, SKETCH_SIZE
+
+def test_stored_aggregates_match_the_live_ones(results):
+    rng = random.Random(11)
+    live = QuestionAnalytics(20)
+    # Few questions and many distinct wrong answers, so sketches fill up and evict
+    for _ in range(2000):
+        qid = rng.randrange(20)
+        if rng.random() < 0.1:
+            live.record_skip(qid)
+            results.record_skip("g", "", qid)
+            continue
+        ok = rng.random() < 0.4
+        answer = f"guess {rng.randrange(3 * SKETCH_SIZE)}"
+        seconds = rng.choice([None, rng.uniform(1, 30)])
+        live.record_answer(qid, answer, ok, seconds)
+        results.record_answer("g", "", qid, answer, ok, seconds)
+    assert results.flush()
+    loaded = QuestionAnalytics(20)
+    loaded.load(results)
+    assert loaded.attempts == live.attempts and loaded.correct == live.correct
+    assert loaded.skips == live.skips
+    assert list(loaded.seconds) == pytest.approx(list(live.seconds))
+    assert loaded.wrong.keys() == live.wrong.keys()
+    for qid, sketch in live.wrong.items():
+        assert list(loaded.wrong[qid]) == list(sketch)
+        assert list(loaded.wrong[qid].values()) == pytest.approx(list(sketch.values()))
+    assert loaded.report() == live.report()
@@ -0,0 +1,33 @@
+# tests/test_answer_index.py
+import pickle
+import sys
+from answer_index import AnswerIndex, answer_index
+from grading import add_alias
+from question_store import QuestionStore
+
+def test_built_without_compiling_answer_keys(monkeypatch, make_store, sample_rows):
+    def no_keys(self, qid):
+        raise AssertionError("answer key compiled")
+    monkeypatch.setattr(QuestionStore, "answer_key", no_keys)
+    index = AnswerIndex(make_store(sample_rows), aliases={})
+    assert index.suggest("mississipi") == ["Mississippi"]
+    assert {"green", "red", "london"} <= set(index._display)
+
+def test_pickles_flat_and_answers_the_same(make_store, sample_rows):
+    index = AnswerIndex(make_store(sample_rows))
+    restored = pickle.loads(pickle.dumps(index))
+    for text in ("mississipi", "lond", "gren", "eigth", "united stats"):
+        assert restored.within(text, 2) == index.within(text, 2)
+        assert restored.suggest(text) == index.suggest(text)
+
+def test_deep_tree_pickles():
+    index = AnswerIndex(QuestionStore(), aliases={})
+    for n in range(sys.getrecursionlimit() * 2):
+        index.add("a" * (n + 1))  # each word hangs below the previous one
+    restored = pickle.loads(pickle.dumps(index))
+    assert restored.within("a" * 50, 1) == index.within("a" * 50, 1)
+
+def test_alias_changes_drop_the_process_index(aliases):
+    assert "zr" not in answer_index()._display
+    add_alias("Zanzibar Republic", "ZR")
+    assert "zr" in answer_index()._display
@@ -0,0 +1,26 @@
+# tests/test_bank_file.py
+from bank_file import open_bank
+
+def test_round_trip(make_bank, sample_rows):
+    bank = make_bank(sample_rows + [{**sample_rows[0], "tolerance": "1"}])
+    assert len(bank) == 6
+    assert bank.text(1) == sample_rows[1]["q"] and bank.answer(1) == "350–400"
+    assert bank.category(0) == "Nature"
+    assert bank.extra(5) == {"tolerance": "1"}
+
+def test_digest_from_header(make_bank, sample_rows):
+    digest = make_bank(sample_rows).content_digest()
+    assert make_bank(sample_rows, "copy.tqb").content_digest() == digest
+    rows = [dict(row) for row in sample_rows]
+    rows[1]["tolerance"] = "10%"
+    assert make_bank(rows, "tolerance.tqb").content_digest() != digest
+    rows = [dict(row) for row in sample_rows]
+    rows[1]["category"] = "Trivia"
+    assert make_bank(rows, "category.tqb").content_digest() != digest
+
+def test_rewrite_keeps_open_banks_readable(make_bank, sample_rows, tmp_path):
+    bank = make_bank([{**sample_rows[0], "q": f"Question {i}?"} for i in range(200)])
+    make_bank([{**sample_rows[1], "q": f"Other {i}?"} for i in range(300)])
+    assert bank.text(199) == "Question 199?"
+    assert open_bank(str(tmp_path / "bank.tqb")).text(299) == "Other 299?"
+    assert [p.name for p in tmp_path.iterdir()] == ["bank.tqb"]
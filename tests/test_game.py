@@ -0,0 +1,42 @@
+# tests/test_game.py
+import pickle
+import pytest
+from game import GameSession, MIX_LABEL
+from question_bank import QUESTIONS
+from sampler import AdaptiveSampler
+
+@pytest.fixture
+def game():
+    return GameSession(sampler=AdaptiveSampler())
+
+def test_play_skip_and_score(game):
+    game.start_with([0, 1, 2])
+    first = game.current()
+    assert game.skip() and game.pending_skips == 1
+    assert game.submit(QUESTIONS[1]["a"]) is True
+    assert game.submit("definitely not it") is False
+    assert game.current() == first and not game.can_skip()
+    game.submit(first["a"])
+    assert game.finished
+    assert game.score()[:2] == (2, 3)
+    assert [ok for _q, _user, ok in game.review()] == [True, False, True]
+
+def test_pickle_keeps_only_game_data(game):
+    game.start_with([3, 4, 5], MIX_LABEL)
+    game.submit(QUESTIONS[3]["a"])
+    game.skip()
+    game.attach(results=object(), leaderboard=object(), analytics=object())
+    restored = pickle.loads(pickle.dumps(game))
+    assert restored.results is None and restored.leaderboard is None
+    assert (restored.position, restored.total, restored.pending_skips) == (1, 3, 1)
+    assert restored.current() == game.current()
+    assert restored.seen == game.seen and restored.game_id == game.game_id
+
+def test_blank_player_name_resets_to_anonymous(results):
+    results.save_seen("ann", b"\x05")
+    assert results.flush()
+    game = GameSession(sampler=AdaptiveSampler(), results=results)
+    game.set_player("ann")
+    assert (game.player, game.seen) == ("ann", 5)
+    game.set_player("  ")
+    assert (game.player, game.seen) == ("", 0)
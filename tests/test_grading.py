@@ -0,0 +1,49 @@
+# tests/test_grading.py
+import pytest
+import grading
+from grading import VerdictCache, add_alias, compile_answer, grade_many, is_correct
+
+MIXED_TOLERANCE = [
+    ("105", compile_answer("100")),
+    ("105", compile_answer("100", "10%")),
+    ("105", compile_answer("100", 5)),
+    ("111", compile_answer("100", "10%")),
+    ("105", "100"),
+]
+
+def _pairs(grading_corpus):
+    return [(u, c) for u, c, _v in grading_corpus] + MIXED_TOLERANCE
+
+def test_grade_many_matches_is_correct(grading_corpus):
+    pairs = _pairs(grading_corpus)
+    assert grade_many(pairs) == [is_correct(u, c) for u, c in pairs]
+    assert grade_many(MIXED_TOLERANCE) == [False, True, True, False, False]
+
+def test_grade_many_in_parallel_matches_is_correct(grading_corpus, monkeypatch):
+    monkeypatch.setattr(grading, "PARALLEL_MIN_ROWS", 100)
+    monkeypatch.setattr(grading, "_BATCH_CHUNK", 1000)
+    pairs = _pairs(grading_corpus)
+    assert grade_many(pairs, processes=2) == [is_correct(u, c) for u, c in pairs]
+
+def test_verdict_cache_hits_and_misses():
+    cache = VerdictCache()
+    key = compile_answer("Mississippi")
+    assert cache.grade(1, "mississipi", key) is True
+    assert cache.grade(1, "  Mississipi ", key) is True  # same normalized answer
+    assert cache.grade(1, "Missouri", key) is False
+    assert cache.grade(2, "mississipi", key) is True     # other question
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 3)
+
+def test_verdict_cache_follows_answer_and_tolerance_changes():
+    cache = VerdictCache()
+    assert cache.grade(1, "Paris", compile_answer("Paris")) is True
+    assert cache.grade(1, "Paris", compile_answer("London")) is False
+    assert cache.grade(1, "105", compile_answer("100")) is False
+    assert cache.grade(1, "105", compile_answer("100", "10%")) is True
+    assert cache.stats()["hits"] == 0
+
+def test_verdict_cache_cleared_by_add_alias(aliases):
+    key = compile_answer("Zanzibar Republic")
+    assert grading.VERDICT_CACHE.grade(1, "zr", key) is False
+    add_alias("Zanzibar Republic", "ZR")
+    assert grading.VERDICT_CACHE.grade(1, "zr", compile_answer("Zanzibar Republic")) is True
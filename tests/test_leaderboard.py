@@ -0,0 +1,36 @@
+# tests/test_leaderboard.py
+import random
+from leaderboard import Leaderboard, OVERALL, game_summary
+from game import MIX_LABEL
+from reloading import reloading
+
+def test_game_summary_runs():
+    s = game_summary(4, 6, bytearray([1, 1, 0, 1, 1, 1]))
+    assert (s["lead"], s["tail"], s["run"], s["all_correct"]) == (2, 3, 3, 0)
+    s = game_summary(3, 3, bytearray([1, 1, 1]))
+    assert (s["lead"], s["tail"], s["run"], s["all_correct"]) == (3, 3, 3, 1)
+
+def test_stored_totals_match_the_live_boards(results):
+    rng = random.Random(5)
+    live = Leaderboard(results=results)
+    for _ in range(60):
+        player = rng.choice(["ann", "bo", "cy", ""])
+        category = rng.choice([MIX_LABEL, "Science", "History"])
+        verdicts = bytearray(rng.random() < 0.8 for _ in range(rng.randint(1, 12)))
+        live.record_game(player, category, sum(verdicts), len(verdicts), verdicts)
+    assert results.flush()
+    loaded = Leaderboard()
+    loaded.load(results)
+    assert loaded.boards() == live.boards()
+    for player in ("ann", "bo", "cy"):
+        for metric in ("best", "accuracy", "streak"):
+            assert loaded.rank(player, OVERALL, metric) == live.rank(player, OVERALL, metric)
+    assert results.query("SELECT count(*) FROM board_players WHERE player = ''") == [(0,)]
+
+def test_reload_right_after_a_game_keeps_it(results):
+    shared = reloading(Leaderboard, 0)  # due on every call, like a run after RELOAD_SECONDS
+    for k in range(50):
+        board = shared(results)
+        board.results = results
+        board.record_game("ann", "Science", k % 7, 10, bytearray([1] * (k % 7) + [0] * (10 - k % 7)))
+        assert shared(results).board(OVERALL).best[0].games == k + 1
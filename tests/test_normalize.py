@@ -0,0 +1,107 @@
+# tests/test_normalize.py
+"""
+Differential test: grading.normalize against the original per-call regex
+pipeline from app_categories.py, kept here verbatim as the reference.
+normalize() also folds accents and typographic punctuation (textfold), so the
+reference runs on folded input.
+"""
+
+import re
+import pytest
+from grading import ALIASES, normalize
+from question_bank import QUESTIONS
+from textfold import fold_text
+
+# ---------------- Reference (original implementation) ----------------
+_NUM_WORDS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16,
+    "seventeen": 17, "eighteen": 18, "nineteen": 19,
+    "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+    "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90,
+    "hundred": 100, "thousand": 1000, "million": 1_000_000, "billion": 1_000_000_000,
+}
+_NUM_TOKEN_RE = re.compile(
+    r"\b(?:(?:zero|one|two|three|four|five|six|seven|eight|nine|ten|"
+    r"eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|"
+    r"twenty|thirty|forty|fifty|sixty|seventy|eighty|ninety|hundred|thousand|"
+    r"million|billion)(?:[\s-]+|$))+",
+    flags=re.I
+)
+
+def _words_to_int(phrase: str):
+    words = [w for w in re.split(r"[\s-]+", phrase.strip().lower()) if w]
+    if not words or not all(w in _NUM_WORDS for w in words):
+        return None
+    total, current = 0, 0
+    for w in words:
+        val = _NUM_WORDS[w]
+        if val < 100:
+            current += val
+        elif val == 100:
+            current = (current or 1) * 100
+        else:  # thousand/million/...
+            total += (current or 1) * val
+            current = 0
+    return total + current
+
+def _replace_number_words(text: str) -> str:
+    def _sub(m):
+        n = _words_to_int(m.group(0))
+        return str(n) if n is not None else m.group(0)
+    return _NUM_TOKEN_RE.sub(_sub, text)
+
+def reference_normalize(s: str) -> str:
+    s = (s or "").lower().strip()
+    s = s.replace("&", "and").replace("’", "'").replace("´", "'").replace("`", "'")
+    s = re.sub(r'(?<=\d),(?=\d{3}\b)', '', s)
+    s = re.sub(r"\bmt[\.]?\s+", "mount ", s)
+    s = re.sub(r"\bst[\.]?\s+", "saint ", s)
+    s = re.sub(r"\b([a-z])[\.\s]+([a-z])\b", r"\1\2", s)
+    s = re.sub(r"\b([a-z])(?:[\.\s]+([a-z])){2,}\b",
+               lambda m: re.sub(r"[\.\s]+", "", m.group(0)), s)
+    s = re.sub(r"[^\w\s]", " ", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    s = re.sub(r"(?<=\d)\s+(?=\d)", "", s)
+    if s.startswith("the "):
+        s = s[4:]
+    s = _replace_number_words(s)
+    return s
+
+# ---------------- Tests ----------------
+def _bank_and_alias_strings():
+    strings = {q["a"] for q in QUESTIONS}
+    for key, variants in ALIASES.items():
+        strings.add(key)
+        strings.update(variants)
+    return sorted(strings)
+
+def test_matches_reference_on_bank_and_aliases():
+    mismatches = [(s, normalize(s), reference_normalize(fold_text(s)))
+                  for s in _bank_and_alias_strings()
+                  if normalize(s) != reference_normalize(fold_text(s))]
+    assert mismatches == []
+
+def test_matches_reference_on_corpus_answers(grading_corpus):
+    inputs = sorted({u for u, _c, _v in grading_corpus if u})
+    mismatches = [s for s in inputs if normalize(s) != reference_normalize(fold_text(s))]
+    assert mismatches == []
+
+@pytest.mark.parametrize("raw, expected", [
+    ("The Beatles", "beatles"),
+    ("U.S.", "us"),
+    ("Mt. Everest", "mount everest"),
+    ("1,250 feet", "1250 feet"),
+    ("twenty-one", "21"),
+    ("Pokémon Go", "pokemon go"),
+    ("Côte d’Ivoire", "cote d ivoire"),
+])
+def test_examples(raw, expected):
+    assert normalize(raw) == expected
+
+def test_cache_counts_hits():
+    normalize("Cache Probe Answer")
+    hits = normalize.cache_info().hits
+    normalize("Cache Probe Answer")
+    assert normalize.cache_info().hits == hits + 1
@@ -0,0 +1,51 @@
+# tests/test_numeric.py
+import pytest
+from grading import is_correct
+from numeric import NumValue, mostly_numeric, parse_numeric
+
+@pytest.mark.parametrize("user, answer, verdict", [
+    # typed values
+    ("375", "350–400", True),
+    ("350 to 400", "350–400", True),
+    ("between 360 and 380", "350–400", True),
+    ("401", "350–400", False),
+    ("100,000,000 pounds", "100 million pounds", True),
+    ("45,600,000,000", "45.6 billion won", True),
+    ("1250 feet", "1,250 feet", True),
+    ("8 July 1982", "July 8, 1982", True),
+    ("1982-07-08", "July 8, 1982", True),
+    ("1983", "July 8, 1982", False),
+    # a bare year against a date
+    ("1994", "October 1994", True),
+    ("1982", "July 8, 1982", False),
+    ("July 8, 1982", "1982", True),
+    ("1995", "October 1994", False),
+    ("October 1994", "1994", True),
+    # titles with digits keep the digit-sequence comparison
+    ("2", "M3GAN 2.0", False),
+    ("2.0", "M3GAN 2.0", False),
+    ("two", "M3GAN 2.0", False),
+    ("M3GAN 2.0", "M3GAN 2.0", True),
+    ("2 4", "2 Cool 4 Skool", False),
+    ("2008", "Call of Duty: World at War (2008)", True),
+    ("4", "Every four years", True),
+    ("40", "The 40-Year-Old Virgin", True),
+    # "N to M" descending is a title, not a range
+    ("7", "9 to 5", False),
+    ("9 to 5", "9 to 5", True),
+])
+def test_numeric_answers(user, answer, verdict):
+    assert is_correct(user, answer) is verdict
+
+def test_mostly_numeric():
+    assert all(map(mostly_numeric, ["206", "350–400", "October 1994", "12 years", "100 million pounds"]))
+    assert not any(map(mostly_numeric, ["M3GAN 2.0", "2 Cool 4 Skool", "Every four years", "Paris"]))
+
+def test_parse_ranges():
+    assert parse_numeric("350–400") == (NumValue("range", 350, 400),)
+    assert parse_numeric("9 to 5") == (NumValue("num", 9, 9), NumValue("num", 5, 5))
+    assert parse_numeric("between 400 and 350") == (NumValue("range", 350, 400),)
+
+def test_nothing_accepted_before_is_rejected(grading_corpus):
+    rejected = [(u, c) for u, c, verdict in grading_corpus if verdict and not is_correct(u, c)]
+    assert rejected == []
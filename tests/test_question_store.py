@@ -0,0 +1,7 @@
+# tests/test_question_store.py
+
+def test_digest_covers_tolerance(make_store, sample_rows):
+    digest = make_store(sample_rows).content_digest()
+    sample_rows[1]["tolerance"] = "10%"
+    assert make_store(sample_rows).content_digest() != digest
+    assert make_store(sample_rows).content_digest() == make_store(sample_rows).content_digest()
@@ -0,0 +1,23 @@
+# tests/test_reloading.py
+from reloading import reloading
+
+class _Counter:
+    def __init__(self):
+        self.loads = []
+
+    def load(self, results):
+        self.loads.append(results)
+
+def test_loads_on_first_use_and_when_due():
+    shared = reloading(_Counter, 3600)
+    assert shared().loads == []          # no store: built, not loaded
+    assert shared("db").loads == ["db"]
+    assert shared("db").loads == ["db"]  # not due yet
+    shared.seconds = 0
+    assert shared("db").loads == ["db", "db"]
+
+def test_invalidate_rebuilds():
+    shared = reloading(_Counter, 3600)
+    first = shared("db")
+    shared.invalidate()
+    assert shared() is not first and shared("db").loads == ["db"]
@@ -0,0 +1,13 @@
+# tests/test_results_store.py
+import time
+
+def test_closed_store_drops_rows_and_does_not_wait(results):
+    results.record_answer("g", "ann", 1, "x", True)
+    results.close()
+    assert results.query("SELECT count(*) FROM answers") == [(1,)]
+    results.record_answer("g", "ann", 2, "y", False)
+    results.record_skip("g", "ann", 3)
+    assert results.dropped == 2
+    started = time.monotonic()
+    assert results.flush(timeout=1.0) is False
+    assert time.monotonic() - started < 0.5
@@ -0,0 +1,72 @@
+# tests/test_sampler.py
+import random
+import pytest
+from sampler import AdaptiveSampler, player_weights, miss_weight, UNIFORM, HARDEST, MISSED
+from game import GameSession
+
+def test_uniform_is_default_and_covers_the_pool():
+    sampler = AdaptiveSampler()
+    for qid in range(5):
+        for _ in range(20):
+            sampler.record(qid, False)
+    drawn = set(sampler.sample(None, len(sampler.misses), random.Random(1)))
+    assert drawn == set(range(len(sampler.misses)))
+    assert sampler.sample(None, 3, random.Random(1)) == sampler.sample(None, 3, random.Random(1), mode=UNIFORM)
+
+def test_uniform_respects_exclude():
+    sampler = AdaptiveSampler()
+    n = len(sampler.misses)
+    exclude = (1 << (n - 4)) - 1
+    assert sorted(sampler.sample(None, 4, random.Random(0), exclude=exclude)) == list(range(n - 4, n))
+    with pytest.raises(ValueError):
+        sampler.sample(None, 5, random.Random(0), exclude=exclude)
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        AdaptiveSampler().sample(None, 1, mode="nope")
+
+def test_weights_are_persisted_and_loaded(results):
+    for ok in (False, False, True):
+        results.record_answer("g", "ann", 7, "x", ok)
+    results.record_answer("g", "", 7, "x", False)
+    assert results.flush()
+    live = AdaptiveSampler()
+    for ok in (False, False, True, False):
+        live.record(7, ok)
+    seeded = AdaptiveSampler()
+    seeded.load(results)
+    assert seeded.weight(7) == pytest.approx(live.weight(7))
+    assert seeded.weight(8) == miss_weight(0, 0)
+    # Anonymous answers count towards the question, not towards any player
+    assert player_weights(results, "ann") == {7: pytest.approx(miss_weight(1.71, 2.71))}
+    assert player_weights(results, "") == {}
+
+def test_hardest_and_missed_favour_misses(results):
+    sampler = AdaptiveSampler()
+    for _ in range(30):
+        sampler.record(0, False)
+        results.record_answer("g", "ann", 1, "x", False)
+    assert results.flush()
+    # Only questions 0, 1 and 2 allowed: a missed one weighs ~0.92 against the 0.5 prior
+    exclude = ((1 << len(sampler.misses)) - 1) & ~0b111
+    rng = random.Random(3)
+    hardest = [sampler.sample(None, 1, rng, exclude=exclude, mode=HARDEST)[0] for _ in range(600)]
+    assert hardest.count(0) > 250
+    weights = player_weights(results, "ann")
+    missed = [sampler.sample(None, 1, rng, exclude=exclude, mode=MISSED, weights=weights)[0]
+              for _ in range(600)]
+    assert missed.count(1) > 250 and missed.count(0) < 250
+
+def test_game_uses_the_players_weights(results):
+    for _ in range(30):
+        results.record_answer("g", "ann", 2, "x", False)
+    assert results.flush()
+    game = GameSession(sampler=AdaptiveSampler(), results=results)
+    game.set_player("ann")
+    full = (1 << len(game.sampler.misses)) - 1
+    hits = 0
+    for seed in range(300):
+        game.seen = full & ~0b111
+        game.start(num_questions=1, rng=random.Random(seed), mode=MISSED)
+        hits += game.qids[0] == 2
+    assert hits > 125
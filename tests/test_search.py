@@ -0,0 +1,24 @@
+# tests/test_search.py
+from search import SearchIndex, SCAN_LIMIT, CHAMPIONS
+
+def _bank(make_store):
+    # "river" is common; the short (best-scoring) river questions are all Geography,
+    # the History ones are long, so none of them make the bank-wide champion list
+    questions = [{"q": "Which river?", "a": f"R{i}", "category": "Geography"}
+                 for i in range(SCAN_LIMIT + CHAMPIONS)]
+    questions += [{"q": "Which river did the army cross in the long campaign of that year?",
+                   "a": f"H{i}", "category": "History"} for i in range(5)]
+    return make_store(questions)
+
+def test_category_filter_applies_before_champion_truncation(make_store):
+    index = SearchIndex(_bank(make_store))
+    assert len(index.postings["river"][0]) > SCAN_LIMIT
+    hits = index.search("river", category="History")
+    assert sorted(hits) == list(range(SCAN_LIMIT + CHAMPIONS, SCAN_LIMIT + CHAMPIONS + 5))
+    assert len(index.search("river", limit=CHAMPIONS * 2)) == CHAMPIONS
+
+def test_category_filter_with_a_rare_term(make_store):
+    index = SearchIndex(_bank(make_store))
+    assert index.search("army river", category="History", limit=3) == [
+        SCAN_LIMIT + CHAMPIONS, SCAN_LIMIT + CHAMPIONS + 1, SCAN_LIMIT + CHAMPIONS + 2]
+    assert index.search("army river", category="Geography") == []
@@ -0,0 +1,46 @@
+# tests/test_similarity.py
+import pytest
+import grading
+from grading import _bounded_edit_distance, is_correct, set_similarity_backend
+
+# Verdicts that changed on purpose since the corpus was recorded: typed numbers
+# (user-013) and accent folding (user-025). Everything else must be reproduced.
+INTENDED_CHANGES = {
+    ("2, 3", "2 and 3"): True,
+    ("350–d00", "350–400"): True,
+    ("375", "350–400"): True,
+    ("100,000,000 pounds", "100 million pounds"): True,
+    ("pokémon go and pokemon go", "pokemon go, pokémon go"): True,
+}
+
+@pytest.fixture
+def backend():
+    yield set_similarity_backend
+    set_similarity_backend("edit_distance")
+
+def test_difflib_backend_reproduces_corpus(grading_corpus, backend):
+    backend("difflib")
+    mismatches = [(u, c, v) for u, c, v in grading_corpus
+                  if is_correct(u, c) != INTENDED_CHANGES.get((u, c), v)]
+    assert mismatches == []
+
+def test_edit_distance_backend_only_more_lenient(grading_corpus, backend):
+    backend("difflib")
+    accepted = [(u, c) for u, c, _v in grading_corpus if is_correct(u, c)]
+    backend("edit_distance")
+    assert [(u, c) for u, c in accepted if not is_correct(u, c)] == []
+
+@pytest.mark.parametrize("a, b, k, expected", [
+    ("kitten", "kitten", 0, 0),
+    ("kitten", "sitten", 4, 2),        # a substitution is a delete plus an insert
+    ("abc", "abcdef", 2, 3),           # length gap alone exceeds k: k + 1
+    ("yet another hierarchically officious oracle",
+     "yet another hierarchicaly oficious oracle", 4, 2),
+])
+def test_bounded_edit_distance(a, b, k, expected):
+    assert _bounded_edit_distance(a, b, k) == expected
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        set_similarity_backend("nope")
+    assert grading._similar is grading._edit_distance_similar
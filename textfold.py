@@ -0,0 +1,58 @@
+# textfold.py
+"""
+Unicode folding for typed and pasted answers: accents stripped to the base
+letter ("Pokémon" -> "Pokemon", "Côte" -> "Cote"), typographic quotes, dashes
+and spaces mapped to ASCII ("350–400" -> "350-400", "d’Ivoire" -> "d'Ivoire"),
+fullwidth forms and ligatures expanded, invisible characters dropped.
+
+Everything is one str.translate table, derived from unicodedata's NFKD
+decompositions at import. Folding is a single translate pass with no
+per-call normalization; grading.normalize and numeric.parse_numeric apply
+the table on their (cached) input. Characters outside the covered blocks
+pass through unchanged.
+"""
+
+import unicodedata
+
+# Blocks whose NFKD forms reduce to ASCII: Latin-1 Supplement, Latin Extended-A/B,
+# Latin Extended Additional, Alphabetic Presentation Forms (ligatures), fullwidth ASCII
+_NFKD_BLOCKS = ((0x00A0, 0x0250), (0x1E00, 0x1F00), (0xFB00, 0xFB07), (0xFF01, 0xFF5F))
+
+# Characters NFKD leaves alone (or folds badly); applied after the NFKD pass
+_EXPLICIT = {
+    # letters without a decomposition
+    "ß": "ss", "ẞ": "SS", "æ": "ae", "Æ": "AE", "œ": "oe", "Œ": "OE", "ø": "o", "Ø": "O",
+    "đ": "d", "Đ": "D", "ð": "d", "Ð": "D", "þ": "th", "Þ": "Th", "ł": "l", "Ł": "L", "ı": "i",
+    # quotes and primes
+    **dict.fromkeys("‘’‚‛′‵´`ʹʻʼˈ", "'"),
+    **dict.fromkeys("“”„‟″‶«»", '"'),
+    # hyphens, dashes, minus signs
+    **dict.fromkeys("‐‑‒–—―−⁃﹘﹣－", "-"),
+    # spaces: no-break, en/em and the other fixed-width spaces, ideographic
+    **dict.fromkeys("\u00a0\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009"
+                    "\u200a\u202f\u205f\u3000", " "),
+    # other punctuation
+    "…": "...", "⁄": "/", "∕": "/", "·": " ", "•": " ",
+    # invisible: soft hyphen, zero-width characters, byte order mark
+    **dict.fromkeys("\u00ad\u200b\u200c\u200d\u2060\ufeff", None),
+}
+
+def _build_table() -> dict:
+    table = {}
+    for lo, hi in _NFKD_BLOCKS:
+        for code in range(lo, hi):
+            ch = chr(code)
+            base = "".join(c for c in unicodedata.normalize("NFKD", ch) if not unicodedata.combining(c))
+            if base != ch and base.isascii():
+                table[code] = base
+    # Combining marks typed or pasted on their own (decomposed input)
+    for code in range(0x0300, 0x0370):
+        table[code] = None
+    table.update(str.maketrans(_EXPLICIT))
+    return table
+
+FOLD_TABLE = _build_table()
+
+def fold_text(s: str) -> str:
+    """Accents, quotes, dashes and spaces folded to ASCII (case kept)."""
+    return s.translate(FOLD_TABLE)